@@ -0,0 +1,191 @@
+# artifact_cache.py - Content-addressed on-disk cache of rendered PDFs
+#
+# A rendered document is filed under a hash of everything that decides its
+# bytes: its worksheets (problems, riddle, decoder mapping and the header
+# details printed with them), the artifact, whether it is combined or
+# imposed, the PDF backend and LAYOUT_VERSION. Both backends write
+# byte-reproducible PDFs, so identical worksheets share one file whichever
+# session, batch or process drew them, and the cache survives restarts.
+#
+# The directory is kept under a size limit by evicting least recently used
+# files. A hit refreshes the file's mtime and eviction rescans the directory,
+# so several processes (the app, the server, CLI runs) can share one cache.
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import astuple
+
+from layout import LAYOUT_VERSION
+
+# Overridable with WORKSHEET_CACHE_DIR and WORKSHEET_CACHE_MB (0 disables the cache)
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "math-worksheets"
+)
+DEFAULT_CACHE_LIMIT = 512 * 1024 * 1024
+# Eviction frees space down to this fraction of the limit, so it runs rarely
+LOW_WATER = 0.9
+
+
+def document_key(document, backend="reportlab"):
+    """Content hash naming an exports.Document's PDF; the file name is not part of it"""
+    content = {
+        "layout": LAYOUT_VERSION,
+        "backend": backend,
+        "artifact": document.artifact,
+        "combined": document.combined,
+        "imposition": document.imposition,
+        "worksheets": [astuple(worksheet) for worksheet in document.worksheets],
+    }
+    return hashlib.sha256(json.dumps(content, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def cache_from_env():
+    """ArtifactCache configured by WORKSHEET_CACHE_DIR and WORKSHEET_CACHE_MB, or None when disabled"""
+    value = os.environ.get("WORKSHEET_CACHE_MB")
+    limit = DEFAULT_CACHE_LIMIT
+    if value:
+        try:
+            limit = max(0, int(float(value) * 1024 * 1024))
+        except ValueError:
+            raise ValueError(f"WORKSHEET_CACHE_MB must be a number, got {value!r}")
+    if not limit:
+        return None
+    return ArtifactCache(os.environ.get("WORKSHEET_CACHE_DIR") or DEFAULT_CACHE_DIR, limit)
+
+
+class ArtifactCache:
+    """PDF bytes by content key in a directory of at most max_bytes, evicted least recently used first"""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_LIMIT):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            self._scan()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.pdf")
+
+    def _scan(self):
+        """Index the files on disk, least recently used first"""
+        found = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir(follow_symlinks=False):
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(".pdf"):
+                    continue
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                found.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        found.sort()
+        self._entries = OrderedDict((key, size) for _, key, size in found)
+        self.total_bytes = sum(self._entries.values())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Cached bytes for key, or None; a hit marks the file most recently used"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            data = None
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                self.total_bytes -= self._entries.pop(key, 0)
+                return None
+            self.hits += 1
+            if key not in self._entries:
+                # Written by another process since the last scan
+                self._entries[key] = len(data)
+                self.total_bytes += len(data)
+            self._entries.move_to_end(key)
+        return data
+
+    def put(self, key, data):
+        """Store data under key, evicting least recently used files once the directory passes max_bytes"""
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        # Write then rename, so readers in other processes never see a partial PDF; a full or
+        # read-only disk costs the cache, never the render
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self.total_bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Remove least recently used files until the directory is back under LOW_WATER of max_bytes"""
+        # Other processes may have added or read files since the last scan
+        self._scan()
+        target = self.max_bytes * LOW_WATER
+        while self.total_bytes > target and self._entries:
+            key, size = self._entries.popitem(last=False)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            self.total_bytes -= size
+            self.evictions += 1
+
+    @property
+    def hit_rate(self):
+        """Fraction of lookups since start-up served from disk"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """Lookups, hit rate and evictions since start-up, and what the directory holds"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hit_rate, 3),
+                "evictions": self.evictions,
+                "files": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self):
+        """Remove every cached file"""
+        with self._lock:
+            for key in self._entries:
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self.total_bytes = 0
@@ -0,0 +1,417 @@
+# batch.py - Parallel generation and rendering of worksheet batches
+#
+# Each (standard, version) pair becomes a WorksheetRequest with its own seed.
+# Workers rebuild nothing per task: every worker process keeps one
+# MathWorksheetGenerator over its own copy of the shared catalog, and the
+# Worksheet value plus whichever PDFs were asked for travel back to the
+# caller. Anything not rendered up front can be rendered later from the
+# Worksheet with render_documents.
+#
+# Given an ArtifactCache, PDFs already on disk are read back instead of
+# rendered, and whatever is rendered is stored for the next batch.
+#
+# A BatchJob runs a batch on a background thread instead, so a caller can show
+# results as they complete and cancel the rest. Given a ClassSet, it schedules
+# the class on the pool first (schedule_task), off the caller's thread.
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+
+from artifact_cache import document_key
+from catalog import RIDDLE_COMPATIBLE_STANDARDS
+from classsets import ClassSet, shared_problems
+from exports import Document, artifact_names, plan_documents, prerendered
+from imposition import sheet_sides
+from layout import PLANNERS, plan_answer_grid, plan_combined
+from rendering import (
+    ARTIFACT_TITLES, ARTIFACTS, render_answer_grid_pdf, render_artifact, render_combined_pdf, render_imposed
+)
+from worksheet_generator import MathWorksheetGenerator, WorksheetRequest, derive_seed, new_seed
+
+# Below this many tasks, process start-up costs more than it saves
+MIN_PARALLEL_TASKS = 4
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Outcome of one batch task; worksheet is None and error is set when generation failed
+
+    worksheet_pdf and answer_pdf are None unless that artifact was requested.
+    """
+    request: WorksheetRequest
+    worksheet: object = None
+    worksheet_pdf: bytes = None
+    answer_pdf: bytes = None
+    error: str = None
+
+
+def default_workers():
+    """Number of cores this process may run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def batch_requests(standards, versions, num_problems, use_riddles, grade=None, batch_seed=None, columns=1):
+    """One request per (standard, version), each with a seed derived from the batch seed"""
+    if batch_seed is None:
+        batch_seed = new_seed()
+    return [
+        WorksheetRequest(
+            code,
+            num_problems,
+            use_riddles and code in RIDDLE_COMPATIBLE_STANDARDS,
+            seed=derive_seed(batch_seed, code, version),
+            version=version,
+            grade=grade,
+            columns=columns
+        )
+        for code in standards
+        for version in range(1, versions + 1)
+    ]
+
+
+_worker_generator = None
+
+
+def _generator():
+    """This worker process's MathWorksheetGenerator"""
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = MathWorksheetGenerator()
+    return _worker_generator
+
+
+def run_task(request, artifacts=ARTIFACTS, backend="reportlab"):
+    """Generate one worksheet and render the given artifacts; runs inside a worker process"""
+    try:
+        worksheet = _generator().generate(request)
+    except ValueError as e:
+        return BatchResult(request, error=str(e))
+    pdfs = {artifact: render_artifact(worksheet, artifact, backend) for artifact in artifacts}
+    return BatchResult(request, worksheet, pdfs.get("worksheet"), pdfs.get("answer"))
+
+
+def schedule_task(class_set):
+    """A ClassSet's requests and shared_problems for them; runs inside a worker process
+
+    Raises ValueError as class_set_requests does.
+    """
+    requests = class_set.requests(_generator())
+    return requests, shared_problems(requests)
+
+
+def plan_document(document):
+    """LayoutPlan for an exports.Document's pages before imposition, without drawing anything"""
+    if document.artifact == "answer_grid":
+        return plan_answer_grid(document.worksheets)
+    if document.combined:
+        return plan_combined(document.worksheets, document.artifact)
+    worksheet, = document.worksheets
+    return PLANNERS[document.artifact](worksheet)
+
+
+def count_pages(documents):
+    """Printed pages (sheet sides, once imposed) per exports.Document, in document order; a dry run of rendering"""
+    return [len(sheet_sides(plan_document(document).page_count, document.imposition)) for document in documents]
+
+
+def render_document(document, backend="reportlab"):
+    """PDF bytes for an exports.Document"""
+    if document.imposition != "none":
+        title = ARTIFACT_TITLES.get(document.artifact, "Answer Key")
+        return render_imposed(plan_document(document), document.imposition, title, document.combined, backend)
+    if document.artifact == "answer_grid":
+        return render_answer_grid_pdf(document.worksheets, backend)
+    if document.combined:
+        return render_combined_pdf(document.worksheets, document.artifact, backend)
+    worksheet, = document.worksheets
+    return render_artifact(worksheet, document.artifact, backend)
+
+
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def get_executor(workers=None):
+    """Process pool shared by every batch in this process, resized when workers changes"""
+    global _executor, _executor_workers
+    workers = workers or default_workers()
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            # spawn: never fork a process that is already running server threads
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _executor_workers = workers
+        return _executor
+
+
+def shutdown_executor():
+    """Stop the shared process pool"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+
+
+atexit.register(shutdown_executor)
+
+
+def _run_all(function, tasks, workers, progress, *args):
+    """function(task, *args) for every task, in task order, inline or on the shared pool"""
+    tasks = list(tasks)
+    total = len(tasks)
+    results = [None] * total
+    workers = workers or default_workers()
+
+    if workers == 1 or total < MIN_PARALLEL_TASKS:
+        for index, task in enumerate(tasks):
+            results[index] = function(task, *args)
+            if progress:
+                progress(index + 1, total)
+        return results
+
+    executor = get_executor(workers)
+    futures = {executor.submit(function, task, *args): index for index, task in enumerate(tasks)}
+    for done, future in enumerate(as_completed(futures), 1):
+        results[futures[future]] = future.result()
+        if progress:
+            progress(done, total)
+    return results
+
+
+def result_documents(results, artifacts):
+    """One Document per requested artifact of each successful BatchResult, in result order"""
+    return [
+        Document(name, artifact, (result.worksheet,))
+        for result in results if not result.error
+        for artifact, name in artifact_names(result.request.standard_code, result.request.version)
+        if artifact in artifacts
+    ]
+
+
+def with_pdfs(results, documents, pdfs):
+    """results with the PDFs of their result_documents filled in"""
+    rendered = {(document.worksheets[0].standard_code, document.worksheets[0].version, document.artifact): pdf
+                for document, pdf in zip(documents, pdfs)}
+    return [
+        result if result.error else replace(
+            result,
+            worksheet_pdf=rendered.get((result.request.standard_code, result.request.version, "worksheet")),
+            answer_pdf=rendered.get((result.request.standard_code, result.request.version, "answer"))
+        )
+        for result in results
+    ]
+
+
+def render_cached(documents, backend, cache, render):
+    """PDF bytes for exports.Documents in order, read from cache where possible
+
+    render(missing, cached) draws the documents not on disk and returns their
+    PDFs; cached is how many were served from disk. Each distinct document is
+    rendered once and stored.
+    """
+    keys = [document_key(document, backend) for document in documents]
+    pdfs = {}
+    missing = {}
+    for key, document in zip(keys, documents):
+        if key in pdfs or key in missing:
+            continue
+        pdf = cache.get(key)
+        if pdf is None:
+            missing[key] = document
+        else:
+            pdfs[key] = pdf
+    for key, pdf in zip(missing, render(list(missing.values()), len(pdfs))):
+        cache.put(key, pdf)
+        pdfs[key] = pdf
+    return [pdfs[key] for key in keys]
+
+
+def generate_batch(requests, workers=None, progress=None, artifacts=ARTIFACTS, backend="reportlab", cache=None):
+    """Generate every request and render the given artifacts, returning BatchResults in request order
+
+    workers=1 (or a batch under MIN_PARALLEL_TASKS) runs in the calling
+    process; otherwise tasks go to the shared process pool.
+    progress(done, total) is called as each task completes.
+    With a cache, tasks only generate and the artifacts then go through
+    render_documents, so worksheets rendered before are read from disk.
+    """
+    if cache is None or not artifacts:
+        return _run_all(run_task, requests, workers, progress, tuple(artifacts), backend)
+
+    requests = list(requests)
+    generated = len(requests)
+    planned = generated * (1 + len(artifacts))
+    results = _run_all(run_task, requests, workers, progress and (lambda done, total: progress(done, planned)),
+                       (), backend)
+    documents = result_documents(results, artifacts)
+    pdfs = render_documents(
+        documents,
+        workers,
+        progress and (lambda done, total: progress(generated + done, generated + total)),
+        backend,
+        cache
+    )
+    return with_pdfs(results, documents, pdfs)
+
+
+class BatchJob:
+    """Generates a batch on a background thread; results arrive as they complete and cancel() stops the rest
+
+    requests may be a ClassSet, scheduled on the job's thread (through the
+    pool) before anything generates; requests is then filled in, and
+    most_shared holds its shared_problems. A class that cannot be scheduled
+    stops the job with the ValueError as error.
+
+    on_result(result) is called on the job's thread for each BatchResult, in
+    completion order. results stays in request order, with None for requests
+    not yet (or, once cancelled, never) completed.
+    """
+
+    def __init__(self, requests, workers=None, artifacts=ARTIFACTS, backend="reportlab", on_result=None):
+        self.class_set = requests if isinstance(requests, ClassSet) else None
+        self.requests = [] if self.class_set is not None else list(requests)
+        self.most_shared = {}
+        self._total = len(self.class_set if self.class_set is not None else self.requests)
+        self.results = [None] * self._total
+        self.done = 0
+        self.error = None
+        self.workers = workers or default_workers()
+        self.artifacts = tuple(artifacts)
+        self.backend = backend
+        self.on_result = on_result
+        self._futures = ()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="batch-job", daemon=True)
+
+    @property
+    def total(self):
+        return self._total
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Drop every task not yet started; tasks already running finish but are not reported
+
+        An on_result call already under way still completes; wait() for it
+        before reusing anything the callback writes to.
+        """
+        self._cancelled.set()
+        for future in self._futures:
+            future.cancel()
+
+    def wait(self, timeout=None):
+        """Block until the job finishes or is cancelled; True once it has stopped"""
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def completed(self):
+        """BatchResults finished so far, in request order"""
+        return [result for result in self.results if result is not None]
+
+    def _run(self):
+        try:
+            if self.class_set is not None:
+                scheduled = self._schedule()
+                if scheduled is None or self.cancelled:
+                    return
+                self.requests, self.most_shared = scheduled
+            for index, result in self._results():
+                if self.cancelled:
+                    return
+                self.results[index] = result
+                self.done += 1
+                if self.on_result:
+                    self.on_result(result)
+        except Exception as e:
+            # Surfaced to the caller through .error; the thread has no one else to tell
+            self.error = e
+
+    def _schedule(self):
+        """schedule_task for the class set, inline or on the shared pool; None if cancelled before it started"""
+        if self.workers == 1:
+            return schedule_task(self.class_set)
+        future = get_executor(self.workers).submit(schedule_task, self.class_set)
+        self._futures = (future,)
+        if self.cancelled:
+            self.cancel()
+        try:
+            return future.result()
+        except CancelledError:
+            return None
+
+    def _results(self):
+        """(request index, BatchResult) in completion order"""
+        if self.workers == 1 or self.total < MIN_PARALLEL_TASKS:
+            for index, request in enumerate(self.requests):
+                if self.cancelled:
+                    return
+                yield index, run_task(request, self.artifacts, self.backend)
+            return
+
+        executor = get_executor(self.workers)
+        futures = {executor.submit(run_task, request, self.artifacts, self.backend): index
+                   for index, request in enumerate(self.requests)}
+        self._futures = tuple(futures)
+        if self.cancelled:
+            self.cancel()
+        for future in as_completed(futures):
+            if self.cancelled:
+                return
+            try:
+                yield futures[future], future.result()
+            except CancelledError:
+                return
+
+
+def render_documents(documents, workers=None, progress=None, backend="reportlab", cache=None):
+    """Render exports.Documents, returning PDF bytes in document order
+
+    With an ArtifactCache, documents already on disk are read back and each
+    distinct missing one is rendered once and stored.
+    """
+    if cache is None:
+        return _run_all(render_document, documents, workers, progress, backend)
+
+    def render(missing, cached):
+        total = cached + len(missing)
+        if progress and total and not missing:
+            progress(total, total)
+        return _run_all(render_document, missing, workers,
+                        progress and (lambda done, _: progress(cached + done, total)), backend)
+
+    return render_cached(list(documents), backend, cache, render)
+
+
+def batch_files(results, output_format="both", layout="separate", workers=None, compact_key=False,
+                imposition="none", backend="reportlab", cache=None):
+    """(file name, PDF bytes) for the successful results of a batch, rendering whatever generation did not"""
+    documents = plan_documents(
+        [result.worksheet for result in results if not result.error],
+        output_format,
+        layout,
+        compact_key,
+        imposition
+    )
+    pdfs = prerendered(results)
+    missing = [document for document in documents if document.name not in pdfs]
+    for document, pdf in zip(missing, render_documents(missing, workers, backend=backend, cache=cache)):
+        pdfs[document.name] = pdf
+    return [(document.name, pdfs[document.name]) for document in documents]
@@ -0,0 +1,42 @@
+# benchmarks/artifact_cache.py - Rendering a batch cold and again from the PDF cache
+#
+# Renders one worksheet and answer key PDF per worksheet into an empty cache,
+# then repeats the same batch, as a re-download or repeat run would, and
+# reports time and hit rate for each pass.
+#
+#     python benchmarks/artifact_cache.py [worksheets]
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from artifact_cache import ArtifactCache
+from batch import batch_requests, generate_batch, render_documents
+from catalog import COMMON_CORE_STANDARDS
+from exports import plan_documents
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    standards = [code for standards in COMMON_CORE_STANDARDS["6th Grade"].values() for code in standards]
+    versions = -(-total // len(standards))
+    results = generate_batch(batch_requests(standards, versions, 10, True, batch_seed=1), workers=1, artifacts=())
+    documents = plan_documents([result.worksheet for result in results if not result.error][:total])
+
+    print(f"{len(documents)} PDFs")
+    print(f"{'pass':<8}{'seconds':>9}{'hit rate':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ArtifactCache(directory)
+        for label in ("cold", "warm"):
+            hits, lookups = cache.hits, cache.hits + cache.misses
+            start = time.perf_counter()
+            render_documents(documents, workers=1, cache=cache)
+            elapsed = time.perf_counter() - start
+            rate = (cache.hits - hits) / (cache.hits + cache.misses - lookups)
+            print(f"{label:<8}{elapsed:>9.2f}{rate:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# benchmarks/batch_scaling.py - Batch throughput versus worker count
+#
+# Generates and renders a full grade (every standard x versions) with
+# generate_batch at 1, 2, 4, ... workers up to the machine's core count.
+#
+#     python benchmarks/batch_scaling.py [grade] [versions]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import batch_requests, default_workers, generate_batch, get_executor
+from catalog import COMMON_CORE_STANDARDS
+
+
+def main():
+    grade = sys.argv[1] if len(sys.argv) > 1 else "6th Grade"
+    versions = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    standards = [code for standards in COMMON_CORE_STANDARDS[grade].values() for code in standards]
+    requests = batch_requests(standards, versions, 10, True, grade=grade, batch_seed=1)
+
+    counts = [1]
+    while counts[-1] * 2 <= default_workers():
+        counts.append(counts[-1] * 2)
+    if counts[-1] != default_workers():
+        counts.append(default_workers())
+
+    print(f"{grade}: {len(requests)} worksheets")
+    print(f"{'workers':>8}{'seconds':>10}{'sheets/s':>10}{'speedup':>9}")
+    baseline = None
+    for workers in counts:
+        if workers > 1:
+            # Warm the pool so start-up is not counted against the run
+            get_executor(workers)
+            generate_batch(requests[:workers * 4], workers=workers)
+        start = time.perf_counter()
+        generate_batch(requests, workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>8}{elapsed:>10.2f}{len(requests) / elapsed:>10.1f}{baseline / elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
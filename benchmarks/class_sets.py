@@ -0,0 +1,61 @@
+# benchmarks/class_sets.py - Scheduling class sets as the roster grows
+#
+# Builds class-set requests for one standard, with and without riddles, for
+# rosters of growing size and reports the time taken, identical worksheet
+# pairs, and the most and mean problems any two students share. Independently
+# drawn versions (batch_requests) are shown alongside for comparison.
+#
+#     python benchmarks/class_sets.py [standard] [problems]
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import batch_requests
+from classsets import class_set_requests
+from worksheet_generator import MathWorksheetGenerator
+
+ROSTERS = (30, 250, 1000, 4000)
+# Pairs compared per roster; every pair for small rosters
+MAX_PAIRS = 200_000
+
+
+def overlap(problem_sets):
+    """(identical pairs, most shared problems, mean shared problems) over up to MAX_PAIRS pairs"""
+    pairs = itertools.islice(itertools.combinations(problem_sets, 2), MAX_PAIRS)
+    shared = [len(a & b) for a, b in pairs]
+    identical = len(problem_sets) - len(set(problem_sets))
+    return identical, max(shared), sum(shared) / len(shared)
+
+
+def main():
+    code = sys.argv[1] if len(sys.argv) > 1 else "6.RP.A.1"
+    num_problems = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    generator = MathWorksheetGenerator()
+
+    print(f"{code}, {num_problems} problems per worksheet")
+    print(f"{'students':>9}  {'mode':<22}{'seconds':>9}{'identical':>11}{'max shared':>12}{'mean shared':>13}")
+    for students in ROSTERS:
+        roster = tuple(f"Student {number}" for number in range(1, students + 1))
+        for riddles in (False, True):
+            start = time.perf_counter()
+            drawn = [frozenset(generator.generate(request).problems)
+                     for request in batch_requests([code], students, num_problems, riddles, batch_seed=1)]
+            drawn_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            requests = class_set_requests(roster, [code], num_problems, riddles, batch_seed=1, generator=generator)
+            elapsed = time.perf_counter() - start
+            scheduled = [frozenset(request.problems) for request in requests]
+
+            suffix = " + riddle" if riddles else ""
+            for mode, seconds, problem_sets in ((f"independent{suffix}", drawn_elapsed, drawn),
+                                                (f"class set{suffix}", elapsed, scheduled)):
+                identical, most, mean = overlap(problem_sets)
+                print(f"{students:>9}  {mode:<22}{seconds:>9.3f}{identical:>11}{most:>12}{mean:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
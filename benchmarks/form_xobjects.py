@@ -0,0 +1,57 @@
+# benchmarks/form_xobjects.py - Page chrome as form XObjects versus drawn inline
+#
+# Renders every version of a standard as one PDF per worksheet and as one
+# document, each with InlineChrome and with FormCache, and reports bytes and
+# render time.
+#
+#     python benchmarks/form_xobjects.py [standard] [versions]
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib import pagesizes
+from reportlab.pdfgen import canvas
+
+from batch import batch_requests
+from rendering import FormCache, InlineChrome, draw_answer_key, draw_worksheet
+from worksheet_generator import MathWorksheetGenerator
+
+
+def render(worksheets, chrome, one_document):
+    """Total bytes of the worksheets and answer keys, as one document or one per PDF"""
+    documents = [worksheets] if one_document else [[worksheet] for worksheet in worksheets]
+    total = 0
+    for group in documents:
+        for draw in (draw_worksheet, draw_answer_key):
+            buffer = io.BytesIO()
+            c = canvas.Canvas(buffer, pagesize=pagesizes.letter)
+            forms = chrome(c)
+            for worksheet in group:
+                draw(c, worksheet, forms)
+                c.showPage()
+            c.save()
+            total += len(buffer.getvalue())
+    return total
+
+
+def main():
+    code = sys.argv[1] if len(sys.argv) > 1 else "6.RP.A.1"
+    versions = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    generator = MathWorksheetGenerator()
+    worksheets = [generator.generate(request) for request in batch_requests([code], versions, 10, True, batch_seed=1)]
+
+    print(f"{code}: {versions} versions, worksheet + answer key")
+    print(f"{'layout':<16}{'chrome':<8}{'bytes':>10}{'ms':>9}")
+    for one_document, label in ((False, "one per PDF"), (True, "one document")):
+        for chrome, name in ((InlineChrome, "inline"), (FormCache, "forms")):
+            start = time.perf_counter()
+            size = render(worksheets, chrome, one_document)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<16}{name:<8}{size:>10}{elapsed * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
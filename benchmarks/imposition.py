@@ -0,0 +1,37 @@
+# benchmarks/imposition.py - Imposing a large batch onto printer sheets
+#
+# Generates a batch, then renders it as one worksheet PDF per batch with each
+# imposition and reports sides, bytes and render time.
+#
+#     python benchmarks/imposition.py [worksheets]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import batch_requests, count_pages, generate_batch, render_document
+from catalog import COMMON_CORE_STANDARDS
+from exports import plan_documents
+from imposition import IMPOSITIONS
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    standards = [code for standards in COMMON_CORE_STANDARDS["6th Grade"].values() for code in standards]
+    versions = -(-total // len(standards))
+    results = generate_batch(batch_requests(standards, versions, 10, True, batch_seed=1), workers=1, artifacts=())
+    worksheets = [result.worksheet for result in results if not result.error][:total]
+
+    print(f"{len(worksheets)} worksheets, one PDF for the batch")
+    print(f"{'imposition':<12}{'sides':>8}{'bytes':>10}{'seconds':>9}")
+    for imposition in IMPOSITIONS:
+        document, = plan_documents(worksheets, "worksheet", "batch", imposition=imposition)
+        start = time.perf_counter()
+        pdf = render_document(document)
+        elapsed = time.perf_counter() - start
+        print(f"{imposition:<12}{count_pages([document])[0]:>8}{len(pdf):>10}{elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
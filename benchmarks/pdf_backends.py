@@ -0,0 +1,42 @@
+# benchmarks/pdf_backends.py - ReportLab versus the native PDF writer
+#
+# Renders the same worksheets with each backend, as one worksheet and answer
+# key PDF per worksheet and as one combined document per artifact, and
+# reports worksheets per second and output size.
+#
+#     python benchmarks/pdf_backends.py [grade] [versions]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import batch_requests, generate_batch
+from catalog import COMMON_CORE_STANDARDS
+from rendering import ARTIFACTS, BACKENDS, render_artifact, render_combined_pdf
+
+
+def main():
+    grade = sys.argv[1] if len(sys.argv) > 1 else "6th Grade"
+    versions = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    standards = [code for standards in COMMON_CORE_STANDARDS[grade].values() for code in standards]
+    requests = batch_requests(standards, versions, 10, True, grade=grade, batch_seed=1)
+    worksheets = [result.worksheet for result in generate_batch(requests, workers=1, artifacts=()) if not result.error]
+
+    print(f"{grade}: {len(worksheets)} worksheets, worksheet + answer key")
+    print(f"{'backend':<11}{'output':<10}{'sheets/s':>10}{'bytes':>12}")
+    for backend in BACKENDS:
+        start = time.perf_counter()
+        size = sum(len(render_artifact(worksheet, artifact, backend))
+                   for worksheet in worksheets for artifact in ARTIFACTS)
+        elapsed = time.perf_counter() - start
+        print(f"{backend:<11}{'separate':<10}{len(worksheets) / elapsed:>10.0f}{size:>12}")
+
+        start = time.perf_counter()
+        size = sum(len(render_combined_pdf(worksheets, artifact, backend)) for artifact in ARTIFACTS)
+        elapsed = time.perf_counter() - start
+        print(f"{backend:<11}{'combined':<10}{len(worksheets) / elapsed:>10.0f}{size:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/server_latency.py - Latency of the HTTP service under concurrent load
+#
+# Starts server.py in-process on a free port, then fires POST /worksheet
+# requests from a number of client threads and reports p50/p99 latency.
+#
+#     python benchmarks/server_latency.py [requests] [clients]
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import get_executor
+from server import WorksheetHandler, WorksheetServer, WorksheetService
+
+STANDARDS = ("6.RP.A.1", "6.NS.C.5", "6.EE.B.7", "7.NS.A.1", "7.EE.B.4")
+
+
+def post(url, payload):
+    request = urllib.request.Request(url, json.dumps(payload).encode(), {"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, time.perf_counter() - start
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    service = WorksheetService()
+    WorksheetHandler.log_message = lambda *args: None
+    get_executor(service.workers)
+    server = WorksheetServer(("127.0.0.1", 0), service)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/worksheet"
+
+    payloads = [{"standard": STANDARDS[i % len(STANDARDS)], "seed": i} for i in range(total)]
+    # Warm every worker process before timing
+    for payload in payloads[:service.workers * 2]:
+        post(url, payload)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        results = list(pool.map(lambda payload: post(url, payload), payloads))
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    latencies = sorted(seconds for status, seconds in results if status == 200)
+    rejected = sum(1 for status, _ in results if status != 200)
+    print(f"{total} requests, {clients} clients, {service.workers} workers, "
+          f"{service.max_concurrent} concurrent: {total / elapsed:.1f} req/s, {rejected} rejected")
+    for p in (50, 90, 99):
+        index = min(len(latencies) - 1, int(p / 100 * len(latencies)))
+        print(f"p{p}: {latencies[index] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# benchmarks/session_memory.py - Per-session memory of MathWorksheetGenerator
+#
+# "Before" gives every session its own catalog (what __init__ used to build);
+# "after" is the default, where sessions share the process-wide catalog.
+#
+#     python benchmarks/session_memory.py [sessions]
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import build_catalog, get_catalog
+from worksheet_generator import MathWorksheetGenerator
+
+
+def measure(make_session, sessions):
+    """Return (bytes retained per session, seconds per session) for a session factory"""
+    tracemalloc.start()
+    start_bytes = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    kept = [make_session() for _ in range(sessions)]
+    elapsed = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0] - start_bytes
+    tracemalloc.stop()
+    del kept
+    return retained / sessions, elapsed / sessions
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    get_catalog()  # Shared catalog is paid once per process, outside the loop
+
+    before = measure(lambda: MathWorksheetGenerator(catalog=build_catalog()), sessions)
+    after = measure(MathWorksheetGenerator, sessions)
+
+    print(f"Sessions: {sessions}")
+    print(f"{'':8}{'bytes/session':>16}{'ms/session':>14}")
+    print(f"{'before':8}{before[0]:16,.0f}{before[1] * 1000:14.3f}")
+    print(f"{'after':8}{after[0]:16,.0f}{after[1] * 1000:14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# benchmarks/text_metrics.py - Layout cost per worksheet as batches grow
+#
+# Plans worksheets and answer keys for growing batches and reports the
+# planning time per worksheet with cold and warm text-metric caches. With the
+# caches warm the per-worksheet cost should stay flat as the batch grows.
+#
+#     python benchmarks/text_metrics.py [standard ...]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import batch_requests
+from layout import plan_answer_key, plan_worksheet
+from textmetrics import clear_caches, text_width, wrap_text
+from worksheet_generator import MathWorksheetGenerator
+
+
+def plan_all(worksheets):
+    """Seconds to plan every worksheet and answer key"""
+    start = time.perf_counter()
+    for worksheet in worksheets:
+        plan_worksheet(worksheet)
+        plan_answer_key(worksheet)
+    return time.perf_counter() - start
+
+
+def main():
+    standards = sys.argv[1:] or ["6.RP.A.3", "6.SP.B.5", "7.EE.B.3"]
+    generator = MathWorksheetGenerator()
+
+    print(f"{'worksheets':>10}{'cold us/ws':>12}{'warm us/ws':>12}{'hit rate':>10}")
+    for versions in (10, 100, 1000):
+        requests = batch_requests(standards, versions, 10, True, batch_seed=1)
+        worksheets = [generator.generate(request) for request in requests]
+        clear_caches()
+        cold = plan_all(worksheets)
+        warm = plan_all(worksheets)
+        hits = text_width.cache_info().hits + wrap_text.cache_info().hits
+        calls = hits + text_width.cache_info().misses + wrap_text.cache_info().misses
+        count = len(worksheets)
+        print(f"{count:>10}{cold / count * 1e6:>12.1f}{warm / count * 1e6:>12.1f}{hits / calls:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
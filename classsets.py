@@ -0,0 +1,323 @@
+# classsets.py - One personalized worksheet per student on a class roster
+#
+# Versions from batch_requests are drawn independently, so two of them can
+# repeat each other. A class set schedules problems across the whole roster
+# instead. The standard's pool (its bank topped up with template problems) is
+# dealt into one column per problem slot, each column holding p problems for
+# a prime p. Student i takes, from column j, the problem at f_i(j) mod p,
+# where f_i is the polynomial over GF(p) whose coefficients are the base-p
+# digits of i. Two distinct polynomials with d coefficients agree on at most
+# d - 1 points, so no two worksheets are identical and any two share at most
+# d - 1 problems. The pool is sized so the roster fits in two digits: students
+# then share at most one problem, and the first p share none. Each worksheet
+# costs O(problems x d), so scheduling grows linearly with the roster.
+#
+# Riddle worksheets need each letter's problems to share an answer, so their
+# pool is kept by answer instead. Every student gets a riddle; each letter
+# takes the least used of a few answers with enough problems, and the least
+# used problems for that answer. A worksheet sharing more than MAX_SHARED
+# problems with an earlier one (found through an index of who uses which
+# problem, as bitmasks) is built again, and one identical to an earlier
+# worksheet is never kept. MAX_SHARED is a target rather than a bound: after
+# REDRAW_ATTEMPTS the least overlapping try is kept, so callers report
+# shared_problems. Use stays balanced, so each problem has about roster x
+# problems / pool users and a worksheet costs O(problems x sqrt(roster)) to
+# check. Standards whose pool is too small for the polynomial schedule are
+# balanced the same way.
+#
+# Nothing is generated here: requests carry their problems (and riddle), and
+# the batch builds the worksheets. Scheduling a large class takes up to a
+# second or two, so front ends hand a ClassSet to the batch, which schedules
+# it on the worker pool (see batch.schedule_task). Each request records the
+# batch seed, which with the roster and settings regenerates its worksheet;
+# its own seed alone does not.
+import csv
+import io
+import math
+import random
+from collections import Counter
+from dataclasses import dataclass, replace
+
+from catalog import RIDDLE_COMPATIBLE_STANDARDS, extract_numeric
+from worksheet_generator import MathWorksheetGenerator, WorksheetRequest, derive_seed, new_seed
+
+# Roster columns holding the whole name, or its parts, by lower-case header
+NAME_HEADERS = ("name", "student", "student name", "full name")
+FIRST_NAME_HEADERS = ("first name", "first")
+LAST_NAME_HEADERS = ("last name", "last")
+
+# Balanced worksheets: problems one may share with any earlier worksheet before
+# it is built again, tries before keeping the least overlapping one, and the
+# candidates (answers or problems) sampled beyond those needed for each choice
+MAX_SHARED = 2
+REDRAW_ATTEMPTS = 4
+CHOICES = 8
+
+
+def _check_roster(names):
+    """Raise ValueError for an empty roster or one naming a student twice"""
+    if not names:
+        raise ValueError("The roster has no student names")
+    repeated = [name for name, count in Counter(names).items() if count > 1]
+    if repeated:
+        raise ValueError(f"The roster lists {', '.join(repeated)} more than once; names must tell "
+                         "students' worksheets apart")
+
+
+def parse_roster(text):
+    """Student names from CSV text: a name column (or first and last name columns) when headed, else the first column"""
+    rows = [[cell.strip() for cell in row] for row in csv.reader(io.StringIO(text))]
+    rows = [row for row in rows if any(row)]
+    if not rows:
+        raise ValueError("The roster has no student names")
+
+    header = [cell.lower() for cell in rows[0]]
+    first = next((header.index(label) for label in FIRST_NAME_HEADERS if label in header), None)
+    last = next((header.index(label) for label in LAST_NAME_HEADERS if label in header), None)
+    column = next((header.index(label) for label in NAME_HEADERS if label in header), None)
+    if column is not None or first is not None or last is not None:
+        rows = rows[1:]
+
+    def name(row):
+        if column is None and (first is not None or last is not None):
+            parts = [row[index] for index in (first, last) if index is not None and index < len(row)]
+            return " ".join(part for part in parts if part)
+        return row[column or 0] if len(row) > (column or 0) else ""
+
+    names = tuple(filter(None, map(name, rows)))
+    _check_roster(names)
+    return names
+
+
+def _is_prime(n):
+    return n >= 2 and all(n % factor for factor in range(2, math.isqrt(n) + 1))
+
+
+def class_pool_size(students, slots):
+    """Problems to pool so every pair of students shares at most one of their slots problems"""
+    columns = max(slots, math.isqrt(max(students - 1, 0)) + 1)
+    while not _is_prime(columns):
+        columns += 1
+    return slots * columns
+
+
+def schedule_problems(students, slots, pool_size):
+    """Pool indices for each student's worksheet of slots problems, no two alike and overlapping as little as possible
+
+    Raises ValueError when pool_size problems cannot make that many different worksheets.
+    """
+    p = pool_size // slots
+    while p >= 2 and not _is_prime(p):
+        p -= 1
+    digits = 1
+    while p >= 2 and p ** digits < students:
+        digits += 1
+    # Columns past the p-th reuse its evaluation points, so only min(p, slots) points tell polynomials apart
+    if p < 2 or digits > min(p, slots):
+        raise ValueError(f"{pool_size} problems cannot make {students} different worksheets of {slots} problems")
+
+    sheets = []
+    for student in range(students):
+        coefficients, rest = [], student
+        for _ in range(digits):
+            rest, digit = divmod(rest, p)
+            coefficients.append(digit)
+        sheet = []
+        for slot in range(slots):
+            point, value = slot % p, 0
+            for coefficient in reversed(coefficients):
+                value = (value * point + coefficient) % p
+            sheet.append(slot * p + value)
+        sheets.append(tuple(sheet))
+    return sheets
+
+
+def _least_used(candidates, count, usage, rng):
+    """count of candidates, the least used of a random sample of them, ties broken at random"""
+    if len(candidates) > count + CHOICES:
+        candidates = rng.sample(candidates, count + CHOICES)
+    return sorted(candidates, key=lambda candidate: (usage[candidate], rng.random()))[:count]
+
+
+def _riddle_sheet(riddle, buckets, eligible, usage, answer_usage, rng):
+    """Problems in the riddle's letter order, each letter on its own answer, or None when answers run out"""
+    letters = riddle[2].upper()
+    chosen = {}
+    used_answers = set()
+    for letter, count in sorted(Counter(letters).items(), key=lambda item: -item[1]):
+        options = eligible.get(count, ())
+        sample = [answer for answer in rng.sample(options, min(CHOICES, len(options))) if answer not in used_answers]
+        sample = sample or [answer for answer in options if answer not in used_answers]
+        if not sample:
+            return None
+        answer = _least_used(sample, 1, answer_usage, rng)[0]
+        used_answers.add(answer)
+        chosen[letter] = _least_used(buckets[answer], count, usage, rng)
+    return [chosen[letter].pop() for letter in letters]
+
+
+def _most_shared(sheet, users):
+    """Most problems sheet has in common with any one earlier worksheet
+
+    users maps a problem to a bitmask of the worksheets using it. The masks
+    are summed bit-sliced, so each problem costs a few big-integer operations
+    however many worksheets use it.
+    """
+    planes = []
+    for problem in sheet:
+        carry = users.get(problem, 0)
+        for index, plane in enumerate(planes):
+            planes[index], carry = plane ^ carry, plane & carry
+            if not carry:
+                break
+        if carry:
+            planes.append(carry)
+    most, candidates = 0, -1
+    for index in reversed(range(len(planes))):
+        if candidates & planes[index]:
+            most |= 1 << index
+            candidates &= planes[index]
+    return most
+
+
+def shared_problems(requests):
+    """Most problems any two worksheets of a standard have in common, by standard, in request order"""
+    users, shared = {}, {}
+    for version, request in enumerate(requests):
+        code = request.standard_code
+        sheet = [(code, problem) for problem in request.problems]
+        shared[code] = max(shared.get(code, 0), _most_shared(sheet, users))
+        for problem in sheet:
+            users[problem] = users.get(problem, 0) | 1 << version
+    return shared
+
+
+def _balanced_requests(generator, base, roster, batch_seed, pool=None):
+    """One request per student with problems (and riddle) chosen by least use, rebuilt while overlapping too much
+
+    pool is the (problem, answer) pairs for worksheets without riddles; riddle
+    worksheets build an answer pool. Raises ValueError when the pool cannot
+    give every student a different worksheet.
+    """
+    code = base.standard_code
+    slots = base.num_problems
+    rng = random.Random(derive_seed(batch_seed, code, "schedule"))
+    size = class_pool_size(len(roster), slots)
+    if base.use_riddles:
+        riddles = generator.riddle_bank.get(slots) or (generator.riddle_for_length(slots, rng),)
+        min_bucket = max(max(Counter(riddle[2].upper()).values()) for riddle in riddles)
+        buckets = generator.answer_pool(code, size, min_bucket, rng)
+        eligible = {count: [answer for answer, problems in buckets.items() if len(problems) >= count]
+                    for count in range(1, min_bucket + 1)}
+    usage = Counter()
+    answer_usage = Counter()
+    users = {}
+    requests = []
+    for version, student in enumerate(roster, 1):
+        best = None
+        for _ in range(REDRAW_ATTEMPTS):
+            riddle = generator.riddle_for_length(slots, rng) if base.use_riddles else None
+            if riddle is not None:
+                sheet = _riddle_sheet(riddle, buckets, eligible, usage, answer_usage, rng)
+            else:
+                sheet = _least_used(pool, slots, usage, rng) if len(pool) >= slots else None
+            if sheet is None:
+                continue
+            shared = _most_shared(sheet, users)
+            if shared < slots and (best is None or shared < best[0]):
+                best = (shared, riddle, sheet)
+                if shared <= MAX_SHARED:
+                    break
+        if best is None:
+            raise ValueError(f"Cannot make {len(roster)} different worksheets for standard {code}. "
+                             "Consider more problems per worksheet or a shorter roster.")
+        _, riddle, sheet = best
+        for problem in sheet:
+            usage[problem] += 1
+            users[problem] = users.get(problem, 0) | 1 << version
+            if riddle is not None:
+                answer_usage[extract_numeric(problem[1])] += 1
+        requests.append(replace(
+            base,
+            seed=derive_seed(batch_seed, code, version),
+            version=version,
+            student=student,
+            problems=tuple(sheet),
+            riddle=riddle,
+            batch_seed=batch_seed
+        ))
+    return requests
+
+
+def _scheduled_requests(generator, base, roster, batch_seed):
+    """One request per student with problems assigned by schedule_problems, or balanced when the pool is too small"""
+    code = base.standard_code
+    rng = random.Random(derive_seed(batch_seed, code, "pool"))
+    pool = generator.problem_pool(code, class_pool_size(len(roster), base.num_problems), rng)
+    try:
+        sheets = schedule_problems(len(roster), base.num_problems, len(pool))
+    except ValueError:
+        return _balanced_requests(generator, base, roster, batch_seed, pool)
+    return [
+        replace(
+            base,
+            seed=derive_seed(batch_seed, code, version),
+            version=version,
+            student=student,
+            problems=tuple(pool[index] for index in sheet),
+            batch_seed=batch_seed
+        )
+        for version, (student, sheet) in enumerate(zip(roster, sheets), 1)
+    ]
+
+
+def class_set_requests(roster, standards, num_problems, use_riddles, grade=None, batch_seed=None, columns=1,
+                       generator=None):
+    """One request per (standard, student), versions numbered in roster order
+
+    Raises ValueError for an empty roster, one naming a student twice, or a
+    standard that cannot give every student a different worksheet.
+    """
+    _check_roster(roster)
+    if batch_seed is None:
+        batch_seed = new_seed()
+    generator = generator or MathWorksheetGenerator()
+    requests = []
+    for code in standards:
+        riddles = use_riddles and code in RIDDLE_COMPATIBLE_STANDARDS and num_problems >= 3
+        base = WorksheetRequest(code, num_problems, riddles, grade=grade, columns=columns)
+        schedule = _balanced_requests if riddles else _scheduled_requests
+        requests.extend(schedule(generator, base, roster, batch_seed))
+    return requests
+
+
+@dataclass(frozen=True)
+class ClassSet:
+    """A class set not yet scheduled: one worksheet per student on roster for each standard
+
+    len() is the number of worksheets it makes. The roster is checked, and a
+    batch seed drawn when none is given, on creation, so requests() always
+    schedules the same worksheets.
+    """
+    roster: tuple
+    standards: tuple
+    num_problems: int
+    use_riddles: bool
+    grade: str = None
+    batch_seed: int = None
+    columns: int = 1
+
+    def __post_init__(self):
+        _check_roster(tuple(self.roster))
+        object.__setattr__(self, "roster", tuple(self.roster))
+        object.__setattr__(self, "standards", tuple(self.standards))
+        if self.batch_seed is None:
+            object.__setattr__(self, "batch_seed", new_seed())
+
+    def __len__(self):
+        return len(self.roster) * len(self.standards)
+
+    def requests(self, generator=None):
+        """The class set's requests; see class_set_requests"""
+        return class_set_requests(self.roster, self.standards, self.num_problems, self.use_riddles, self.grade,
+                                  self.batch_seed, self.columns, generator)
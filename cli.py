@@ -0,0 +1,226 @@
+# cli.py - Headless batch worksheet generator
+#
+#     python cli.py --grade 6 --standards all --versions 10 --output worksheets.zip
+#     python cli.py --grade 7 --standards 7.NS.A.1 7.EE.B.3 --no-riddles --output out/
+#     python cli.py --grade 6 --versions 30 --layout batch --format worksheet --output class.pdf
+#     python cli.py --grade 6 --versions 30 --layout batch --imposition 4up --output print-shop/
+#     python cli.py --grade 6 --standards 6.EE.A.1 --roster period3.csv --layout batch --output period3/
+import argparse
+import os
+import sys
+import time
+
+from artifact_cache import cache_from_env
+from batch import batch_files, batch_requests, count_pages, default_workers, generate_batch
+from catalog import COMMON_CORE_STANDARDS, GRADES
+from classsets import MAX_SHARED, class_set_requests, parse_roster, shared_problems
+from exports import LAYOUTS, OUTPUT_FORMATS, check_imposition, generation_artifacts, plan_documents, write_zip
+from imposition import IMPOSITIONS
+from rendering import BACKENDS
+from layout import COLUMNS
+from worksheet_generator import new_seed
+
+
+def resolve_grade(value):
+    """Accept '6', '6th', or the full '6th Grade' label"""
+    for key, grade in GRADES.items():
+        if value in (key, grade, f"{key}th"):
+            return grade
+    raise argparse.ArgumentTypeError(f"unknown grade {value!r}; choose from {', '.join(GRADES)}")
+
+
+def resolve_standards(grade, requested):
+    """Expand 'all' and check every code belongs to the grade"""
+    available = [code for standards in COMMON_CORE_STANDARDS[grade].values() for code in standards]
+    if requested == ["all"]:
+        return available
+    unknown = [code for code in requested if code not in available]
+    if unknown:
+        raise SystemExit(f"error: not {grade} standards: {', '.join(unknown)}")
+    return requested
+
+
+def write_output(files, output):
+    """Write files into a ZIP or PDF (by output's extension) or a directory; returns the count"""
+    if output.lower().endswith(".zip"):
+        return write_zip(files, output)
+    if output.lower().endswith(".pdf"):
+        if len(files) != 1:
+            raise SystemExit(f"error: {len(files)} files to write; a .pdf output needs exactly one "
+                             "(use --layout batch with --format worksheet or answer)")
+        with open(output, "wb") as f:
+            f.write(files[0][1])
+        return 1
+
+    count = 0
+    os.makedirs(output, exist_ok=True)
+    for name, data in files:
+        with open(os.path.join(output, name), "wb") as f:
+            f.write(data)
+        count += 1
+    return count
+
+
+def report_class_set(requests):
+    """Print the most problems two students share, with a note for each standard past MAX_SHARED"""
+    most_shared = shared_problems(requests)
+    for code, shared in most_shared.items():
+        if shared > MAX_SHARED:
+            print(f"note: {code}: some students share {shared} problems; the standard has too few different "
+                  "problems to spread them further", file=sys.stderr)
+    print(f"Class set: any two students share at most {max(most_shared.values())} problem(s) of a standard")
+
+
+def dry_run(results, args, batch_seed, start):
+    """Print the files a batch would produce and their page counts, without rendering"""
+    documents = plan_documents(
+        [result.worksheet for result in results if not result.error],
+        args.output_format,
+        args.layout,
+        args.compact_key,
+        args.imposition
+    )
+    pages = count_pages(documents)
+    elapsed = time.perf_counter() - start
+
+    totals = {}
+    for document, count in zip(documents, pages):
+        files, total = totals.get(document.artifact, (0, 0))
+        totals[document.artifact] = (files + 1, total + count)
+    labels = {"worksheet": "worksheets", "answer": "answer keys", "answer_grid": "answer grids"}
+    for artifact, (files, total) in totals.items():
+        print(f"{labels[artifact]}: {total} pages in {files} file(s)")
+    print(f"Total: {sum(pages)} pages in {len(documents)} file(s), planned in {elapsed:.2f}s")
+    print(f"Batch seed: {batch_seed}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Generate math worksheets without the web app")
+    parser.add_argument("--grade", type=resolve_grade, required=True, help="6 or 7")
+    parser.add_argument("--standards", nargs="+", default=["all"], help="standard codes, or 'all' (default)")
+    parser.add_argument("--versions", type=int, default=1, help="versions per standard (default 1)")
+    parser.add_argument("--roster", metavar="CSV",
+                        help="class roster; replaces --versions with one named worksheet per student, "
+                             "no two alike")
+    parser.add_argument("--problems", type=int, default=8, help="problems per worksheet (default 8)")
+    parser.add_argument("--riddles", action=argparse.BooleanOptionalAction, default=True,
+                        help="include riddles where the standard supports them (default on)")
+    parser.add_argument("--columns", type=int, choices=COLUMNS, default=1,
+                        help="problems in one column (default) or two, packed onto as few pages as possible")
+    parser.add_argument("--seed", type=int, help="batch seed; reuse it to regenerate the same worksheets")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="both", dest="output_format",
+                        help="which PDFs to write (default both)")
+    parser.add_argument("--layout", choices=LAYOUTS, default="separate",
+                        help="one PDF per worksheet (default), per standard, or for the whole batch")
+    parser.add_argument("--compact-key", action="store_true",
+                        help="replace answer keys with one versions x problems grid per standard")
+    parser.add_argument("--imposition", choices=IMPOSITIONS, default="none",
+                        help="place 2 or 4 pages on each printed side, or fold into duplex booklets (default none); "
+                             "needs --layout standard or batch")
+    parser.add_argument("--output", help="directory, or a path ending in .zip (or .pdf for one file)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report the files and page counts the batch would print, without rendering")
+    parser.add_argument("--backend", choices=BACKENDS, default="reportlab",
+                        help="PDF writer: reportlab (default), or native for faster, smaller class-set runs")
+    parser.add_argument("--cache", action=argparse.BooleanOptionalAction, default=True,
+                        help="reuse PDFs rendered by earlier runs from the on-disk cache, configured by "
+                             "WORKSHEET_CACHE_DIR and WORKSHEET_CACHE_MB (default on)")
+    parser.add_argument("--workers", type=int, default=default_workers(),
+                        help="worker processes (default: all cores)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.versions < 1 or args.problems < 3:
+        raise SystemExit("error: need --versions >= 1 and --problems >= 3")
+    if not args.output and not args.dry_run:
+        raise SystemExit("error: --output is required unless --dry-run is given")
+    try:
+        check_imposition(args.layout, args.imposition)
+    except ValueError as e:
+        raise SystemExit(f"error: {e}")
+    standards = resolve_standards(args.grade, args.standards)
+    use_riddles = args.riddles
+    if use_riddles and args.problems > 15:
+        print("note: riddles need 15 problems or fewer; generating without riddles", file=sys.stderr)
+        use_riddles = False
+    batch_seed = new_seed() if args.seed is None else args.seed
+    try:
+        cache = cache_from_env() if args.cache and not args.dry_run else None
+    except ValueError as e:
+        raise SystemExit(f"error: {e}")
+
+    if args.roster:
+        try:
+            with open(args.roster, encoding="utf-8-sig", newline="") as f:
+                roster = parse_roster(f.read())
+            requests = class_set_requests(
+                roster,
+                standards,
+                args.problems,
+                use_riddles,
+                grade=args.grade,
+                batch_seed=batch_seed,
+                columns=args.columns
+            )
+        except (OSError, ValueError) as e:
+            raise SystemExit(f"error: {e}")
+    else:
+        requests = batch_requests(
+            standards,
+            args.versions,
+            args.problems,
+            use_riddles,
+            grade=args.grade,
+            batch_seed=batch_seed,
+            columns=args.columns
+        )
+
+    start = time.perf_counter()
+    results = generate_batch(
+        requests,
+        workers=args.workers,
+        backend=args.backend,
+        cache=cache,
+        artifacts=() if args.dry_run else generation_artifacts(
+            args.output_format,
+            args.layout,
+            args.compact_key,
+            args.imposition
+        )
+    )
+    failed = [result for result in results if result.error]
+    for result in failed:
+        print(f"warning: {result.request.standard_code} v{result.request.version}: {result.error}", file=sys.stderr)
+    generated = len(results) - len(failed)
+
+    if args.roster:
+        report_class_set(requests)
+    if args.dry_run:
+        return dry_run(results, args, batch_seed, start)
+
+    files = batch_files(
+        results,
+        args.output_format,
+        args.layout,
+        args.workers,
+        args.compact_key,
+        args.imposition,
+        args.backend,
+        cache
+    )
+    written = write_output(files, args.output)
+    elapsed = time.perf_counter() - start
+
+    print(f"Generated {generated} worksheets ({written} files) in {elapsed:.2f}s "
+          f"- {generated / elapsed:.1f} worksheets/s with {args.workers} worker(s)")
+    if cache is not None:
+        print(f"PDF cache: {cache.hits} of {cache.hits + cache.misses} PDFs served from disk")
+    print(f"Batch seed: {batch_seed}")
+    return 1 if failed and not generated else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+# exports.py - Naming and packaging of rendered worksheet PDFs
+import io
+import zipfile
+from dataclasses import dataclass, replace
+
+from imposition import IMPOSITIONS
+
+OUTPUT_FORMATS = ("both", "worksheet", "answer")
+
+# Sidebar download options in the app, by output format
+DOWNLOAD_OPTIONS = {
+    "Worksheet + Answer Key": "both",
+    "Worksheet Only": "worksheet",
+    "Answer Key Only": "answer",
+}
+
+# PDFs each output format needs
+FORMAT_ARTIFACTS = {
+    "both": ("worksheet", "answer"),
+    "worksheet": ("worksheet",),
+    "answer": ("answer",),
+}
+
+ARTIFACT_SUFFIXES = {"worksheet": "worksheet", "answer": "answer_key"}
+COMBINED_SUFFIXES = {"worksheet": "worksheets", "answer": "answer_keys"}
+
+# One PDF per worksheet, one per standard, or one for the whole batch
+LAYOUTS = ("separate", "standard", "batch")
+
+# Sidebar PDF layout options in the app
+LAYOUT_OPTIONS = {
+    "Separate files": "separate",
+    "One PDF per standard": "standard",
+    "One PDF for the batch": "batch",
+}
+
+# Sidebar imposition options in the app
+IMPOSITION_OPTIONS = {
+    "One page per sheet": "none",
+    "2 pages per sheet": "2up",
+    "4 pages per sheet": "4up",
+    "Duplex booklet": "booklet",
+}
+
+# Files whose contents are already compressed; deflating them again costs CPU for ~0 bytes
+PRECOMPRESSED_EXTENSIONS = (".pdf", ".zip", ".png", ".jpg", ".jpeg")
+
+
+@dataclass(frozen=True)
+class Document:
+    """One output PDF: an artifact ('worksheet' or 'answer') for one or more worksheets
+
+    imposition is 'none' for one page per sheet, or how pages are placed on
+    printer sheets ('2up', '4up' or 'booklet').
+    """
+    name: str
+    artifact: str
+    worksheets: tuple
+    combined: bool = False
+    imposition: str = "none"
+
+
+def artifact_names(standard, version, output_format="both"):
+    """(artifact, file name) pairs for one worksheet, artifact being 'worksheet' or 'answer'"""
+    for artifact in FORMAT_ARTIFACTS[output_format]:
+        yield artifact, f"{standard}_v{version}_{ARTIFACT_SUFFIXES[artifact]}.pdf"
+
+
+def generation_artifacts(output_format="both", layout="separate", compact_key=False, imposition="none"):
+    """PDFs to render while generating; combined, imposed and compact-key PDFs render afterwards from the worksheets"""
+    if layout != "separate" or imposition != "none":
+        return ()
+    return tuple(artifact for artifact in FORMAT_ARTIFACTS[output_format]
+                 if not (compact_key and artifact == "answer"))
+
+
+def check_imposition(layout, imposition):
+    """Raise ValueError unless imposition is known and can be used with layout
+
+    Imposition places several pages of one PDF on each sheet, so separate
+    files, one worksheet each, would print alone with the rest of the sheet empty.
+    """
+    if imposition not in IMPOSITIONS:
+        raise ValueError(f"imposition must be one of {', '.join(IMPOSITIONS)}, not {imposition!r}")
+    if imposition != "none" and layout == "separate":
+        raise ValueError(f"imposition {imposition} needs the standard or batch layout, which put several "
+                         "worksheets in one PDF")
+
+
+def _groups(worksheets, layout):
+    """File-name prefix -> worksheets: one group for the batch, or one per standard"""
+    if layout == "batch":
+        return {"": list(worksheets)} if worksheets else {}
+    groups = {}
+    for worksheet in worksheets:
+        groups.setdefault(f"{worksheet.standard_code}_", []).append(worksheet)
+    return groups
+
+
+def plan_documents(worksheets, output_format="both", layout="separate", compact_key=False, imposition="none"):
+    """Documents to render for worksheets (in batch order) under an output format and layout
+
+    With compact_key, answer keys become one consolidated versions x problems
+    grid per standard (or one for the whole batch with the batch layout).
+    Imposed documents are named with the imposition, e.g. worksheets_2up.pdf;
+    imposition needs the standard or batch layout (see check_imposition).
+    """
+    check_imposition(layout, imposition)
+    worksheets = tuple(worksheets)
+    artifacts = [artifact for artifact in FORMAT_ARTIFACTS[output_format]
+                 if not (compact_key and artifact == "answer")]
+    if layout == "separate":
+        documents = [
+            Document(name, artifact, (worksheet,))
+            for worksheet in worksheets
+            for artifact, name in artifact_names(worksheet.standard_code, worksheet.version, output_format)
+            if artifact in artifacts
+        ]
+    else:
+        documents = [
+            Document(f"{prefix}{COMBINED_SUFFIXES[artifact]}.pdf", artifact, tuple(group), combined=True)
+            for prefix, group in _groups(worksheets, layout).items()
+            for artifact in artifacts
+        ]
+
+    if compact_key and "answer" in FORMAT_ARTIFACTS[output_format]:
+        documents += [
+            Document(f"{prefix}answer_grid.pdf", "answer_grid", tuple(group), combined=True)
+            for prefix, group in _groups(worksheets, "batch" if layout == "batch" else "standard").items()
+        ]
+    if imposition != "none":
+        documents = [replace(document, name=f"{document.name[:-4]}_{imposition}.pdf", imposition=imposition)
+                     for document in documents]
+    return documents
+
+
+def prerendered(results):
+    """File name -> PDF bytes for the artifacts already rendered with a batch's results"""
+    pdfs = {}
+    for result in results:
+        if result.error:
+            continue
+        rendered = {"worksheet": result.worksheet_pdf, "answer": result.answer_pdf}
+        for artifact, name in artifact_names(result.request.standard_code, result.request.version):
+            if rendered[artifact] is not None:
+                pdfs[name] = rendered[artifact]
+    return pdfs
+
+
+def output_files(results, output_format="both"):
+    """(file name, PDF bytes) for every successful BatchResult, named as in the app's ZIP"""
+    for result in results:
+        if result.error:
+            continue
+        pdfs = {"worksheet": result.worksheet_pdf, "answer": result.answer_pdf}
+        for artifact, name in artifact_names(result.request.standard_code, result.request.version, output_format):
+            yield name, pdfs[artifact]
+
+
+def compression_for(name):
+    """Store already-compressed files as-is and deflate everything else"""
+    if name.lower().endswith(PRECOMPRESSED_EXTENSIONS):
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def write_zip(files, target):
+    """Write (name, bytes) pairs into a ZIP at a path or file object; returns the count"""
+    count = 0
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for name, data in files:
+            zip_file.writestr(name, data, compress_type=compression_for(name))
+            count += 1
+    return count
+
+
+def zip_bytes(files):
+    """ZIP archive of (name, bytes) pairs, in memory"""
+    buffer = io.BytesIO()
+    write_zip(files, buffer)
+    return buffer.getvalue()
@@ -0,0 +1,56 @@
+# fonts.py - Bundled Unicode fallback faces for the standard fonts
+#
+# Helvetica only encodes WinAnsi, so characters such as "→", "−" or "⁵" used
+# to fall back to Symbol or ZapfDingbats, which draws superscripts as
+# dingbats. Text keeps Helvetica wherever it can and switches to the matching
+# DejaVu Sans face bundled in fonts/ for anything else. The files are subsets
+# (Latin, Greek, punctuation, super- and subscripts, number forms, arrows and
+# math operators); see fonts/LICENSE_DEJAVU.
+#
+# Each face is parsed and registered once per process, on first use, and its
+# glyph tables are shared by every render; each PDF embeds only the glyphs it
+# draws, and the usual handful of subsets are built once and reused.
+import os
+from functools import lru_cache
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
+
+# Layout font -> (registered name, file in FONT_DIR) of its fallback face
+FALLBACK_FONTS = {
+    "Helvetica": ("DejaVuSans", "DejaVuSans.ttf"),
+    "Helvetica-Bold": ("DejaVuSans-Bold", "DejaVuSans-Bold.ttf"),
+    "Helvetica-Oblique": ("DejaVuSans-Oblique", "DejaVuSans-Oblique.ttf"),
+}
+
+
+@lru_cache(maxsize=None)
+def fallback_font(font):
+    """Registered fallback face for font, registering it on first use; None when font has none"""
+    if font not in FALLBACK_FONTS:
+        return None
+    name, filename = FALLBACK_FONTS[font]
+    # Fallback runs never hold ASCII, so subsets need not reserve its codes
+    pdfmetrics.registerFont(TTFont(name, os.path.join(FONT_DIR, filename), asciiReadable=False))
+    return name
+
+
+@lru_cache(maxsize=None)
+def glyph_font(font, char):
+    """Font that draws char: font itself, or its fallback face when font cannot encode char"""
+    fallback = fallback_font(font)
+    if fallback is None:
+        return font
+    try:
+        char.encode(pdfmetrics.getFont(font).encName)
+    except UnicodeEncodeError:
+        return fallback
+    return font
+
+
+@lru_cache(maxsize=256)
+def subset_program(font, chars):
+    """TrueType program for a registered face holding only the code points in chars, in code order"""
+    return pdfmetrics.getFont(font).face.makeSubset(list(chars))
@@ -0,0 +1,66 @@
+# imposition.py - Placing logical pages onto printer sheets
+#
+# An imposition puts 2 or 4 letter pages side by side on each printed side,
+# or folds a document into a duplex booklet: letter sheets printed on both
+# sides (flip on the short edge), folded in half and stapled, so half-size
+# pages read in order. Only page numbers and transforms are decided here;
+# rendering.py draws each page once as a form and places it.
+from dataclasses import dataclass
+
+from reportlab.lib import pagesizes
+
+from layout import PAGE_SIZE
+
+IMPOSITIONS = ("none", "2up", "4up", "booklet")
+
+
+@dataclass(frozen=True)
+class Slot:
+    """Where one page goes on a sheet side: lower-left corner and uniform scale"""
+    x: float
+    y: float
+    scale: float
+
+
+def _slots(sheet_size, columns, rows):
+    """Slots in reading order for a columns x rows grid, each page scaled to fit and centred in its cell"""
+    sheet_width, sheet_height = sheet_size
+    page_width, page_height = PAGE_SIZE
+    cell_width, cell_height = sheet_width / columns, sheet_height / rows
+    scale = min(cell_width / page_width, cell_height / page_height)
+    x_margin = (cell_width - page_width * scale) / 2
+    y_margin = (cell_height - page_height * scale) / 2
+    return tuple(
+        Slot(column * cell_width + x_margin, (rows - 1 - row) * cell_height + y_margin, scale)
+        for row in range(rows)
+        for column in range(columns)
+    )
+
+
+# Sheet size and slots for each imposition
+SHEETS = {
+    "2up": (pagesizes.landscape(pagesizes.letter), _slots(pagesizes.landscape(pagesizes.letter), 2, 1)),
+    "4up": (pagesizes.letter, _slots(pagesizes.letter, 2, 2)),
+    "booklet": (pagesizes.landscape(pagesizes.letter), _slots(pagesizes.landscape(pagesizes.letter), 2, 1)),
+}
+
+
+def sheet_sides(page_count, imposition):
+    """Printed sides, each a tuple of (slot index, page index); blank slots are left out"""
+    if imposition == "none":
+        return tuple(((0, page),) for page in range(page_count))
+    if imposition == "booklet":
+        # Pad to whole folded sheets; each sheet carries the outermost remaining pages
+        padded = -(-page_count // 4) * 4
+        sides = []
+        for sheet in range(padded // 4):
+            sides.append(((0, padded - 1 - 2 * sheet), (1, 2 * sheet)))
+            sides.append(((0, 2 * sheet + 1), (1, padded - 2 - 2 * sheet)))
+        return tuple(tuple((slot, page) for slot, page in side if page < page_count) for side in sides)
+    if imposition not in SHEETS:
+        raise ValueError(f"imposition must be one of {', '.join(IMPOSITIONS)}, not {imposition!r}")
+    per_side = len(SHEETS[imposition][1])
+    return tuple(
+        tuple(enumerate(range(start, min(start + per_side, page_count))))
+        for start in range(0, page_count, per_side)
+    )
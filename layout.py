@@ -0,0 +1,551 @@
+# layout.py - Page layout plans for worksheets and answer keys
+#
+# A LayoutPlan lists everything that goes on each page, decided once per
+# worksheet without a canvas. The PDF renderers only replay plans, the app
+# reads page counts from them, and a dry run can size a whole batch without
+# drawing anything.
+from dataclasses import dataclass
+
+from reportlab.lib import pagesizes
+
+from textmetrics import text_width, wrap_text
+
+# Bump whenever a change alters the PDF drawn for the same worksheet; it keys
+# the on-disk artifact cache, so older PDFs are then never served again
+LAYOUT_VERSION = 3
+
+PAGE_SIZE = pagesizes.letter
+ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+# Consolidated answer key: problems per band, cell and row sizes in points
+GRID_COLUMNS = 10
+GRID_MARGIN = 40
+GRID_LABEL_WIDTH = 30
+# Label column when rows are class-set students rather than versions
+GRID_NAME_WIDTH = 90
+GRID_ROW_HEIGHT = 13
+GRID_LETTER_ROW_HEIGHT = 21
+
+# Baseline-to-baseline distance of wrapped lines, by font size
+LEADING = {11: 14, 12: 15}
+
+# Worksheets print in one column or two
+COLUMNS = (1, 2)
+# Two-column worksheets: gap between the columns, lowest baseline, and the
+# problem spacings tried from roomiest to tightest (24 still clears the boxes)
+COLUMN_GAP = 20
+TWO_COLUMN_BOTTOM = 50
+TWO_COLUMN_SPACINGS = (30, 27, 24)
+
+
+@dataclass(frozen=True)
+class Text:
+    """A line of text; align is 'left' or 'centre' (x is then the centre)"""
+    x: float
+    y: float
+    text: str
+    font: str = "Helvetica"
+    size: float = 11
+    align: str = "left"
+
+
+@dataclass(frozen=True)
+class Rect:
+    x: float
+    y: float
+    width: float
+    height: float
+
+
+@dataclass(frozen=True)
+class Rule:
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+
+
+@dataclass(frozen=True)
+class Chrome:
+    """Static items drawn relative to (x, y); the same key always holds the same items"""
+    key: object
+    x: float
+    y: float
+    items: tuple
+
+
+@dataclass(frozen=True)
+class Bookmark:
+    """Outline entry pointing at the page it is on"""
+    title: str
+    level: int = 0
+
+
+@dataclass(frozen=True)
+class Page:
+    items: tuple
+
+
+@dataclass(frozen=True)
+class LayoutPlan:
+    pages: tuple
+
+    @property
+    def page_count(self):
+        return len(self.pages)
+
+    def __add__(self, other):
+        return LayoutPlan(self.pages + other.pages)
+
+
+class _Pages:
+    """Collects items page by page"""
+
+    def __init__(self):
+        self._pages = []
+        self._items = []
+
+    def add(self, *items):
+        self._items.extend(items)
+
+    def new_page(self):
+        self._pages.append(Page(tuple(self._items)))
+        self._items = []
+
+    def plan(self):
+        if self._items or not self._pages:
+            self.new_page()
+        return LayoutPlan(tuple(self._pages))
+
+
+def _riddle_boxes(length):
+    """Numbered answer boxes for a riddle answer of length letters, relative to the first row"""
+    per_row = int((PAGE_SIZE[0] - 100) // 35) + 1
+    items = []
+    for i in range(length):
+        x_pos = 50 + (i % per_row) * 35
+        y_pos = -40 * (i // per_row)
+        items.append(Rect(x_pos, y_pos, 30, 30))
+        items.append(Text(x_pos + 12, y_pos - 15, str(i + 1), size=9))
+    return tuple(items)
+
+
+def _worksheet_header(pages, worksheet):
+    """Title, name and date lines, standard and seed shared by every worksheet layout"""
+    width, height = PAGE_SIZE
+    if worksheet.student is None:
+        name_date = Chrome("name_date", 0, 0, (
+            Text(width - 200, height - 50, "Name: _________________", size=12),
+            Text(width - 200, height - 70, "Date: _________________", size=12),
+        ))
+    else:
+        name_date = Chrome("date", 0, 0, (Text(width - 200, height - 70, "Date: _________________", size=12),))
+    pages.add(
+        Text(50, height - 50, f"Math Worksheet #{worksheet.version}", "Helvetica-Bold", 18),
+        name_date,
+        Chrome(("standard", worksheet.standard_code, worksheet.grade), 0, 0, (
+            Text(50, height - 90, f"Standard: {worksheet.standard_code} - {worksheet.standard_name}"),
+            Text(50, height - 110, f"Grade: {worksheet.grade}"),
+        )),
+    )
+    if worksheet.student is not None:
+        pages.add(_name_line(worksheet.student))
+    if worksheet.seed is not None:
+        pages.add(_seed_line(worksheet))
+
+
+def _seed_line(worksheet):
+    """What regenerates the worksheet: its seed, or for a class set the batch seed and roster place"""
+    if worksheet.batch_seed is not None:
+        return Text(50, 30, f"Batch seed: {worksheet.batch_seed}, student {worksheet.version}", size=8)
+    return Text(50, 30, f"Seed: {worksheet.seed}", size=8)
+
+
+def _name_line(student):
+    """A class-set student's name where the blank name line would be"""
+    width, height = PAGE_SIZE
+    return _fitted_text(width - 200, height - 50, f"Name: {student}", 150, size=12, min_size=8, align="left")
+
+
+def _instructions():
+    """Riddle instructions under the header"""
+    return Chrome("instructions", 0, 0, (
+        Text(50, PAGE_SIZE[1] - 140, "Solve each problem. Match answers to letters to decode the riddle!",
+             "Helvetica-Bold", 12),
+    ))
+
+
+def _problem_lines(number, problem, max_width):
+    """A problem line wrapped to max_width, and the indent of its continuation lines"""
+    label = f"{number}. "
+    indent = text_width(label, "Helvetica", 11)
+    return wrap_text(f"{label}{problem} = _______", "Helvetica", 11, max_width, indent), indent
+
+
+def _add_problem(pages, x, y_pos, lines, indent, box_x=None):
+    """A wrapped problem from baseline y_pos, with its riddle answer box beside the last line"""
+    for n, line in enumerate(lines):
+        pages.add(Text(x + (indent if n else 0), y_pos - n * LEADING[11], line))
+    if box_x is not None:
+        pages.add(Rect(box_x, y_pos - LEADING[11] * (len(lines) - 1) - 5, 30, 20))
+
+
+def _riddle_question(riddle):
+    return wrap_text(riddle[0], "Helvetica", 12, PAGE_SIZE[0] - 100)
+
+
+def _riddle_depth(riddle):
+    """Distance from the riddle heading's baseline down to the lowest box number"""
+    boxes = _riddle_boxes(len(riddle[2]))
+    return 95 + LEADING[12] * (len(_riddle_question(riddle)) - 1) - min(item.y for item in boxes)
+
+
+def _add_riddle(pages, riddle, y_pos):
+    """Riddle heading, question, and answer boxes from y_pos down"""
+    question = _riddle_question(riddle)
+    pages.add(Chrome("riddle_heading", 0, y_pos, (Text(50, 0, "RIDDLE:", "Helvetica-Bold", 14),)))
+    for n, line in enumerate(question):
+        pages.add(Text(50, y_pos - 25 - n * LEADING[12], line, size=12))
+    y_pos -= 60 + LEADING[12] * (len(question) - 1)
+    pages.add(Text(50, y_pos, "Answer:", size=12))
+    y_pos -= 35
+    pages.add(Chrome(("riddle_boxes", len(riddle[2])), 0, y_pos, _riddle_boxes(len(riddle[2]))))
+
+
+def plan_worksheet(worksheet):
+    """Page plan for the student worksheet, in one column or two"""
+    if worksheet.columns == 2:
+        return plan_two_column_worksheet(worksheet)
+
+    problems = worksheet.problems
+    riddle = worksheet.riddle
+    letter_mapping = worksheet.letter_mapping
+    use_riddles = riddle is not None
+    width, height = PAGE_SIZE
+    pages = _Pages()
+    _worksheet_header(pages, worksheet)
+    y_pos = height - 140
+
+    # Riddle instructions and letter mapping table
+    if use_riddles and letter_mapping:
+        pages.add(_instructions())
+        y_pos -= 25
+
+        for start in range(0, 26, 9):
+            line = [f"{letter}={letter_mapping.get(letter, '?')}" for letter in ALPHABET[start:start + 9]]
+            pages.add(Text(50, y_pos, "  ".join(line), size=9))
+            y_pos -= 15
+        y_pos -= 10
+
+    # Problems, wrapped under their number so they stay clear of the answer boxes
+    text_right = width - 110 if use_riddles else width - 50
+    for i, (problem, answer) in enumerate(problems):
+        lines, indent = _problem_lines(i + 1, problem, text_right - 50)
+        extra = LEADING[11] * (len(lines) - 1)
+        if y_pos - extra < 100:
+            pages.new_page()
+            y_pos = height - 50
+
+        _add_problem(pages, 50, y_pos, lines, indent, width - 100 if use_riddles else None)
+        y_pos -= 30 + extra
+
+    # Riddle section
+    if use_riddles:
+        if y_pos - LEADING[12] * (len(_riddle_question(riddle)) - 1) < 150:
+            pages.new_page()
+            y_pos = height - 100
+        _add_riddle(pages, riddle, y_pos)
+
+    return pages.plan()
+
+
+def _decoder_rows(letter_mapping, max_width):
+    """Decoder entries packed into as few 9pt rows as fit in max_width"""
+    rows = []
+    row = ""
+    for letter in ALPHABET:
+        entry = f"{letter}={letter_mapping.get(letter, '?')}"
+        if row and text_width(f"{row}  {entry}", "Helvetica", 9) > max_width:
+            rows.append(row)
+            row = ""
+        row = f"{row}  {entry}" if row else entry
+    rows.append(row)
+    return rows
+
+
+def _column_end(heights, start, capacity):
+    """Index after the last block that fits in a column starting at start (at least one block)"""
+    end = start + 1
+    used = heights[start] if heights[start:] else 0
+    while end < len(heights) and used + heights[end] <= capacity:
+        used += heights[end]
+        end += 1
+    return min(end, len(heights))
+
+
+def _balanced_split(heights, start):
+    """Index splitting heights[start:] into two columns whose taller one is as short as possible"""
+    total = sum(heights[start:])
+    best, best_height, left = start, total, 0
+    for index in range(start, len(heights)):
+        left += heights[index]
+        if max(left, total - left) < best_height:
+            best, best_height = index + 1, max(left, total - left)
+    return best
+
+
+def _plan_two_columns(worksheet, spacing, decoder_first):
+    """Two-column worksheet with the given problem spacing and the decoder above the problems or the riddle"""
+    riddle = worksheet.riddle
+    use_riddles = riddle is not None
+    width, height = PAGE_SIZE
+    column_width = (width - 100 - COLUMN_GAP) / 2
+    pages = _Pages()
+    _worksheet_header(pages, worksheet)
+    y_top = height - 140
+
+    decoder = _decoder_rows(worksheet.letter_mapping, width - 100) if use_riddles else []
+    if use_riddles:
+        pages.add(_instructions())
+        y_top -= 25
+        if decoder_first:
+            for n, row in enumerate(decoder):
+                pages.add(Text(50, y_top - n * 15, row, size=9))
+            y_top -= 15 * len(decoder) + 10
+
+    # Blocks go down the left column, then the right; a block's height is the
+    # distance to the next baseline, so its own box sits spacing - 5 above it
+    blocks = [
+        _problem_lines(i + 1, problem, column_width - 40 if use_riddles else column_width)
+        for i, (problem, answer) in enumerate(worksheet.problems)
+    ]
+    heights = [spacing + LEADING[11] * (len(lines) - 1) for lines, indent in blocks]
+
+    def place(start, end, column, y_pos):
+        x = 50 + column * (column_width + COLUMN_GAP)
+        box_x = x + column_width - 30 if use_riddles else None
+        for index in range(start, end):
+            lines, indent = blocks[index]
+            _add_problem(pages, x, y_pos, lines, indent, box_x)
+            y_pos -= heights[index]
+        return y_pos
+
+    start = 0
+    while True:
+        capacity = y_top - TWO_COLUMN_BOTTOM + spacing - 5
+        middle = _column_end(heights, start, capacity)
+        end = _column_end(heights, middle, capacity) if middle < len(heights) else middle
+        if end >= len(heights):
+            break
+        place(start, middle, 0, y_top)
+        place(middle, end, 1, y_top)
+        pages.new_page()
+        y_top = height - 50
+        start = end
+
+    # Last page: balance the columns so the riddle has the most room below them
+    middle = _balanced_split(heights, start)
+    y_pos = min(place(start, middle, 0, y_top), place(middle, len(heights), 1, y_top))
+
+    if use_riddles:
+        decoder_height = 0 if decoder_first else 15 * len(decoder) + 10
+        if y_pos - decoder_height - _riddle_depth(riddle) < TWO_COLUMN_BOTTOM:
+            pages.new_page()
+            y_pos = height - 50
+        if not decoder_first:
+            for row in decoder:
+                pages.add(Text(50, y_pos, row, size=9))
+                y_pos -= 15
+            y_pos -= 10
+        _add_riddle(pages, riddle, y_pos)
+
+    return pages.plan()
+
+
+def plan_two_column_worksheet(worksheet):
+    """Two-column worksheet on as few pages as possible, preferring roomier spacing and the decoder on top"""
+    best = None
+    for spacing in TWO_COLUMN_SPACINGS:
+        for decoder_first in (True, False) if worksheet.riddle else (True,):
+            plan = _plan_two_columns(worksheet, spacing, decoder_first)
+            if plan.page_count == 1:
+                return plan
+            if best is None or plan.page_count < best.page_count:
+                best = plan
+    return best
+
+
+def plan_answer_key(worksheet):
+    """Page plan for one worksheet's answer key"""
+    riddle = worksheet.riddle
+    use_riddles = riddle is not None
+    width, height = PAGE_SIZE
+    pages = _Pages()
+
+    pages.add(
+        Text(50, height - 50, f"Answer Key - Worksheet #{worksheet.version}", "Helvetica-Bold", 16),
+        Chrome(("key_standard", worksheet.standard_code), 0, 0, (
+            Text(50, height - 80, f"Standard: {worksheet.standard_code} - {worksheet.standard_name}", size=10),
+        )),
+    )
+    if worksheet.student is not None:
+        pages.add(_name_line(worksheet.student))
+    if worksheet.seed is not None:
+        pages.add(_seed_line(worksheet))
+
+    y_pos = height - 110
+    for i, (problem, answer) in enumerate(worksheet.problems):
+        label = f"{i+1}. "
+        indent = text_width(label, "Helvetica", 12)
+        lines = wrap_text(f"{label}{answer}", "Helvetica", 12, 190 if use_riddles else width - 100, indent)
+        extra = LEADING[12] * (len(lines) - 1)
+        if y_pos - extra < 100:
+            pages.new_page()
+            y_pos = height - 50
+
+        for n, line in enumerate(lines):
+            pages.add(Text(50 + (indent if n else 0), y_pos - n * LEADING[12], line, size=12))
+        if use_riddles and i < len(riddle[2]):
+            pages.add(Text(250, y_pos, f"→ Letter: {riddle[2][i]}", size=12))
+        y_pos -= 25 + extra
+
+    if use_riddles:
+        pages.add(Text(50, y_pos - 30, f"RIDDLE ANSWER: {riddle[1]}", "Helvetica-Bold", 14))
+
+    return pages.plan()
+
+
+def _fitted_text(x, y, text, max_width, font="Helvetica", size=8, min_size=5, align="centre"):
+    """Text centred (or left-aligned) in max_width, shrinking the font (then truncating) until it fits"""
+    while size > min_size and text_width(text, font, size) > max_width:
+        size -= 0.5
+    while len(text) > 1 and text_width(text, font, size) > max_width:
+        text = text[:-2] + "…"
+    return Text(x + max_width / 2 if align == "centre" else x, y, text, font, size, align)
+
+
+def _grid_label(worksheet):
+    """Row label in the answer grid: the class-set student, else the version"""
+    return worksheet.student if worksheet.student is not None else f"v{worksheet.version}"
+
+
+def _plan_grid(pages, worksheets, y_pos):
+    """Versions x problems answer grid for one standard, breaking pages between bands, or between rows of a band
+    taller than a page"""
+    width, height = PAGE_SIZE
+    first = worksheets[0]
+    columns = max(len(worksheet.problems) for worksheet in worksheets)
+    band_columns = min(GRID_COLUMNS, columns)
+    named = any(worksheet.student is not None for worksheet in worksheets)
+    label_width = GRID_NAME_WIDTH if named else GRID_LABEL_WIDTH
+    cell_width = (width - 2 * GRID_MARGIN - label_width) / band_columns
+    has_letters = any(worksheet.riddle for worksheet in worksheets)
+    row_height = GRID_LETTER_ROW_HEIGHT if has_letters else GRID_ROW_HEIGHT
+    band_height = 18 + row_height * len(worksheets)
+    # Bands that fit on a page stay together; taller ones need room for their header and first row
+    band_space = band_height if band_height <= height - 2 * GRID_MARGIN else 18 + row_height
+
+    def ensure(space):
+        nonlocal y_pos
+        if y_pos - space < GRID_MARGIN:
+            pages.new_page()
+            y_pos = height - GRID_MARGIN
+
+    def band_header(numbers):
+        nonlocal y_pos
+        pages.add(Text(GRID_MARGIN, y_pos, "Student" if named else "Ver.", "Helvetica-Bold", 8))
+        for column, number in enumerate(numbers):
+            x = GRID_MARGIN + label_width + column * cell_width
+            pages.add(Text(x + cell_width / 2, y_pos, str(number + 1), "Helvetica-Bold", 8, "centre"))
+        pages.add(Rule(GRID_MARGIN, y_pos - 3, GRID_MARGIN + label_width + len(numbers) * cell_width, y_pos - 3))
+        y_pos -= 12
+
+    ensure(20 + band_space)
+    pages.add(
+        Bookmark(first.standard_code),
+        Text(GRID_MARGIN, y_pos, f"{first.standard_code} - {first.standard_name}", "Helvetica-Bold", 11),
+    )
+    y_pos -= 16
+
+    for start in range(0, columns, band_columns):
+        ensure(band_space)
+        numbers = range(start, min(start + band_columns, columns))
+        band_header(numbers)
+
+        for worksheet in worksheets:
+            if y_pos - row_height < GRID_MARGIN:
+                pages.new_page()
+                y_pos = height - GRID_MARGIN
+                pages.add(Text(GRID_MARGIN, y_pos, f"{first.standard_code} (continued)", "Helvetica-Bold", 9))
+                y_pos -= 14
+                band_header(numbers)
+            letters = worksheet.riddle[2] if worksheet.riddle else ""
+            if named:
+                pages.add(_fitted_text(GRID_MARGIN, y_pos, _grid_label(worksheet), label_width - 4, "Helvetica-Bold",
+                                       8, align="left"))
+            else:
+                pages.add(Text(GRID_MARGIN, y_pos, _grid_label(worksheet), "Helvetica-Bold", 8))
+            for column, number in enumerate(numbers):
+                if number >= len(worksheet.problems):
+                    continue
+                x = GRID_MARGIN + label_width + column * cell_width
+                pages.add(_fitted_text(x + 2, y_pos, worksheet.problems[number][1], cell_width - 4))
+                if number < len(letters):
+                    pages.add(Text(x + cell_width / 2, y_pos - 8, f"({letters[number]})",
+                                   "Helvetica-Oblique", 7, "centre"))
+            y_pos -= row_height
+        y_pos -= 6
+
+    riddles = [f"{_grid_label(worksheet)}: {worksheet.riddle[1]}" for worksheet in worksheets if worksheet.riddle]
+    if riddles:
+        ensure(12)
+        pages.add(Text(GRID_MARGIN, y_pos, "Riddle answers:", "Helvetica-Bold", 8))
+        x = GRID_MARGIN + text_width("Riddle answers:  ", "Helvetica-Bold", 8)
+        for entry in riddles:
+            entry_width = text_width(entry + "    ", "Helvetica", 8)
+            if x + entry_width > width - GRID_MARGIN:
+                y_pos -= 11
+                ensure(11)
+                x = GRID_MARGIN + GRID_LABEL_WIDTH
+            pages.add(Text(x, y_pos, entry, size=8))
+            x += entry_width
+        y_pos -= 11
+    return y_pos - 14
+
+
+def plan_answer_grid(worksheets):
+    """Consolidated answer key: one versions x problems grid per standard, riddle letters under answers"""
+    height = PAGE_SIZE[1]
+    standards = {}
+    for worksheet in worksheets:
+        standards.setdefault(worksheet.standard_code, []).append(worksheet)
+
+    pages = _Pages()
+    pages.add(Text(GRID_MARGIN, height - GRID_MARGIN, "Answer Key - All Versions", "Helvetica-Bold", 14))
+    y_pos = height - GRID_MARGIN - 24
+    for group in standards.values():
+        y_pos = _plan_grid(pages, group, y_pos)
+    return pages.plan()
+
+
+PLANNERS = {
+    "worksheet": plan_worksheet,
+    "answer": plan_answer_key,
+}
+
+
+def plan_combined(worksheets, artifact):
+    """One plan holding an artifact for every worksheet, bookmarked per standard and version"""
+    pages = []
+    current_standard = None
+    for worksheet in worksheets:
+        bookmarks = []
+        if worksheet.standard_code != current_standard:
+            current_standard = worksheet.standard_code
+            bookmarks.append(Bookmark(f"{worksheet.standard_code} - {worksheet.standard_name}", 0))
+        title = f"Version {worksheet.version}"
+        bookmarks.append(Bookmark(title if worksheet.student is None else f"{title} - {worksheet.student}", 1))
+        first, *rest = PLANNERS[artifact](worksheet).pages
+        pages.append(Page(tuple(bookmarks) + first.items))
+        pages.extend(rest)
+    return LayoutPlan(tuple(pages))
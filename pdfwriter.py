@@ -0,0 +1,295 @@
+# pdfwriter.py - Minimal PDF writer for LayoutPlans
+#
+# Worksheets only need standard Type 1 fonts, text, rectangles, rules,
+# bookmarks and reusable chrome, so this writes those objects directly
+# instead of going through ReportLab's canvas. Glyphs Helvetica lacks come
+# from the bundled fallback faces (see fonts.py), embedded as TrueType subsets
+# of only the glyphs each document draws, and no timestamps are written, so
+# the same plan always gives the same bytes.
+import zlib
+
+from reportlab.pdfbase.pdfmetrics import getFont, unicode2T1
+from reportlab.pdfbase.ttfonts import FF_NONSYMBOLIC, FF_SYMBOLIC, SUBSETN, TTFont, makeToUnicodeCMap
+
+from fonts import subset_program
+from imposition import SHEETS, sheet_sides
+from layout import PAGE_SIZE, Bookmark, Chrome, Rect, Rule, Text
+from textmetrics import text_runs, text_width
+
+# Fonts with their own built-in encoding; every other font uses WinAnsi
+SYMBOLIC_FONTS = ("Symbol", "ZapfDingbats")
+
+
+def _number(value):
+    """Shortest PDF number for value"""
+    if value == int(value):
+        return str(int(value))
+    return f"{value:.6f}".rstrip("0").rstrip(".")
+
+
+def _string(data):
+    """PDF literal string for encoded bytes, non-ASCII bytes as octal escapes"""
+    out = []
+    for byte in data:
+        if byte in b"()\\":
+            out.append("\\" + chr(byte))
+        elif 32 <= byte < 127:
+            out.append(chr(byte))
+        else:
+            out.append(f"\\{byte:03o}")
+    return "(" + "".join(out) + ")"
+
+
+def _text_string(text):
+    """PDF text string (UTF-16BE with a byte order mark) for titles and outline entries"""
+    return "<FEFF" + text.encode("utf-16-be").hex().upper() + ">"
+
+
+class _Objects:
+    """Numbered PDF objects, written out with a cross-reference table"""
+
+    def __init__(self):
+        self._bodies = []
+
+    def reserve(self):
+        self._bodies.append(None)
+        return len(self._bodies)
+
+    def set(self, number, body):
+        self._bodies[number - 1] = body if isinstance(body, bytes) else body.encode("latin-1")
+
+    def add(self, body):
+        number = self.reserve()
+        self.set(number, body)
+        return number
+
+    def add_stream(self, dictionary, content):
+        data = zlib.compress(content if isinstance(content, bytes) else content.encode("latin-1"))
+        return self.add(f"<< {dictionary} /Filter /FlateDecode /Length {len(data)} >>\nstream\n".encode("latin-1")
+                        + data + b"\nendstream")
+
+    def output(self, root, info):
+        out = bytearray(b"%PDF-1.4\n%\x93\x8c\x8b\x9e\n")
+        offsets = []
+        for number, body in enumerate(self._bodies, 1):
+            offsets.append(len(out))
+            out += f"{number} 0 obj\n".encode("latin-1") + body + b"\nendobj\n"
+        xref = len(out)
+        out += f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n".encode("latin-1")
+        out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+        out += (f"trailer\n<< /Size {len(offsets) + 1} /Root {root} 0 R /Info {info} 0 R >>\n"
+                f"startxref\n{xref}\n%%EOF\n").encode("latin-1")
+        return bytes(out)
+
+
+class _Writer:
+    """One PDF document: fonts, forms and pages share a single resource dictionary"""
+
+    def __init__(self, shared_chrome):
+        self.objects = _Objects()
+        self.resources = self.objects.reserve()
+        self.fonts = {}
+        self.subsets = {}
+        self.forms = {}
+        self.chrome = {}
+        self.shared_chrome = shared_chrome
+
+    def _font(self, name, subset=None):
+        """Resource name for a standard font, or for one 256-glyph subset of an embedded TrueType font"""
+        if (name, subset) not in self.fonts:
+            self.fonts[name, subset] = f"F{len(self.fonts) + 1}"
+        return self.fonts[name, subset]
+
+    def _encode(self, font, text):
+        """(resource name, bytes) runs for text in a font"""
+        face = getFont(font)
+        if not isinstance(face, TTFont):
+            return [(self._font(used.fontName), data) for used, data in unicode2T1(text, [face] + face.substitutionFonts)]
+        # TrueType glyphs get one-byte codes in order of first use, 256 per subset
+        subsets, codes = self.subsets.setdefault(font, ([], {}))
+        runs = []
+        for char in text:
+            if char not in codes:
+                if not subsets or len(subsets[-1]) == 256:
+                    subsets.append([])
+                codes[char] = (len(subsets) - 1, len(subsets[-1]))
+                subsets[-1].append(ord(char))
+            subset, code = codes[char]
+            name = self._font(font, subset)
+            if runs and runs[-1][0] == name:
+                runs[-1][1].append(code)
+            else:
+                runs.append((name, [code]))
+        return [(name, bytes(data)) for name, data in runs]
+
+    def _text(self, item):
+        x = item.x - text_width(item.text, item.font, item.size) / 2 if item.align == "centre" else item.x
+        ops = [f"BT 1 0 0 1 {_number(x)} {_number(item.y)} Tm"]
+        for font, run in text_runs(item.text, item.font):
+            for name, data in self._encode(font, run):
+                ops.append(f"/{name} {_number(item.size)} Tf {_string(data)} Tj")
+        ops.append("ET")
+        return " ".join(ops)
+
+    def _chrome(self, item):
+        if not self.shared_chrome:
+            return f"q 1 0 0 1 {_number(item.x)} {_number(item.y)} cm\n{self.content(item.items)}\nQ"
+        name = self.chrome.get(item.key)
+        if name is None:
+            name = self.chrome[item.key] = self.form(self.content(item.items), -PAGE_SIZE[1])
+        return f"q 1 0 0 1 {_number(item.x)} {_number(item.y)} cm /{name} Do Q"
+
+    def content(self, items):
+        """Content stream operators for layout items; bookmarks are handled by the caller"""
+        ops = []
+        for item in items:
+            if isinstance(item, Text):
+                ops.append(self._text(item))
+            elif isinstance(item, Rect):
+                ops.append(f"{_number(item.x)} {_number(item.y)} {_number(item.width)} {_number(item.height)} re S")
+            elif isinstance(item, Rule):
+                ops.append(f"{_number(item.x1)} {_number(item.y1)} m {_number(item.x2)} {_number(item.y2)} l S")
+            elif isinstance(item, Chrome):
+                ops.append(self._chrome(item))
+        return "\n".join(ops)
+
+    def form(self, content, bottom=0):
+        """Name of a new form XObject holding content, one page wide, from bottom to the page height"""
+        name = f"X{len(self.forms) + 1}"
+        width, height = PAGE_SIZE
+        self.forms[name] = self.objects.add_stream(
+            f"/Type /XObject /Subtype /Form /BBox [0 {_number(bottom)} {_number(width)} {_number(height)}] "
+            f"/Resources {self.resources} 0 R",
+            content
+        )
+        return name
+
+    def output(self, pages, page_size, bookmarks, title, outline):
+        """PDF bytes for (content, ...) pages; bookmarks are (title, level, page index) in outline order"""
+        objects = self.objects
+        tree = objects.reserve()
+        page_numbers = []
+        for content in pages:
+            stream = objects.add_stream("", content)
+            page_numbers.append(objects.add(
+                f"<< /Type /Page /Parent {tree} 0 R /MediaBox [0 0 {_number(page_size[0])} {_number(page_size[1])}] "
+                f"/Resources {self.resources} 0 R /Contents {stream} 0 R >>"
+            ))
+        objects.set(tree, f"<< /Type /Pages /Kids [{' '.join(f'{n} 0 R' for n in page_numbers)}] "
+                          f"/Count {len(page_numbers)} >>")
+
+        fonts = " ".join(
+            f"/{name} {objects.add(self._font_dictionary(font, subset, name))} 0 R"
+            for (font, subset), name in self.fonts.items()
+        )
+        forms = " ".join(f"/{name} {number} 0 R" for name, number in self.forms.items())
+        objects.set(self.resources, f"<< /ProcSet [/PDF /Text] /Font << {fonts} >> /XObject << {forms} >> >>")
+
+        catalog = f"/Type /Catalog /Pages {tree} 0 R"
+        if bookmarks:
+            catalog += f" /Outlines {self._outline(bookmarks, page_numbers)} 0 R"
+        if outline:
+            catalog += " /PageMode /UseOutlines"
+        root = objects.add(f"<< {catalog} >>")
+        info = "/Producer (worksheets pdfwriter)"
+        if title:
+            info += f" /Title {_text_string(title)}"
+        return objects.output(root, objects.add(f"<< {info} >>"))
+
+    def _font_dictionary(self, font, subset, name):
+        if subset is None:
+            encoding = "" if font in SYMBOLIC_FONTS else " /Encoding /WinAnsiEncoding"
+            return f"<< /Type /Font /Subtype /Type1 /Name /{name} /BaseFont /{font}{encoding} >>"
+        face = getFont(font).face
+        chars = self.subsets[font][0][subset]
+        base = (SUBSETN(subset) + b"+" + face.name).decode("latin-1")
+        data = subset_program(font, tuple(chars))
+        font_file = self.objects.add_stream(f"/Length1 {len(data)}", data)
+        flags = face.flags & ~FF_NONSYMBOLIC | FF_SYMBOLIC
+        descriptor = self.objects.add(
+            f"<< /Type /FontDescriptor /FontName /{base} /Flags {flags} "
+            f"/FontBBox [{' '.join(_number(value) for value in face.bbox)}] /ItalicAngle {_number(face.italicAngle)} "
+            f"/Ascent {_number(face.ascent)} /Descent {_number(face.descent)} /CapHeight {_number(face.capHeight)} "
+            f"/StemV {_number(face.stemV)} /FontFile2 {font_file} 0 R >>"
+        )
+        to_unicode = self.objects.add_stream("", makeToUnicodeCMap(base, chars))
+        widths = " ".join(_number(face.getCharWidth(char)) for char in chars)
+        return (f"<< /Type /Font /Subtype /TrueType /Name /{name} /BaseFont /{base} /FirstChar 0 "
+                f"/LastChar {len(chars) - 1} /Widths [{widths}] /FontDescriptor {descriptor} 0 R "
+                f"/ToUnicode {to_unicode} 0 R >>")
+
+    def _outline(self, bookmarks, page_numbers):
+        """Outline tree for (title, level, page index) entries; returns the outline root's object number"""
+        objects = self.objects
+        root = objects.reserve()
+        entries = []
+        parents = [{"number": root, "children": []}]
+        for title, level, page in bookmarks:
+            if level > len(parents) - 1:
+                raise ValueError(f"outline level {level} under level {len(parents) - 2} needs intermediates")
+            del parents[level + 1:]
+            entry = {"number": objects.reserve(), "title": title, "page": page_numbers[page],
+                     "parent": parents[-1], "children": []}
+            parents[-1]["children"].append(entry)
+            parents.append(entry)
+            entries.append(entry)
+
+        def count(entry):
+            return sum(1 + count(child) for child in entry["children"])
+
+        def links(entry):
+            children = entry["children"]
+            if not children:
+                return ""
+            return (f" /First {children[0]['number']} 0 R /Last {children[-1]['number']} 0 R"
+                    f" /Count {count(entry)}")
+
+        for entry in entries:
+            siblings = entry["parent"]["children"]
+            position = siblings.index(entry)
+            body = (f"<< /Title {_text_string(entry['title'])} /Parent {entry['parent']['number']} 0 R "
+                    f"/Dest [{entry['page']} 0 R /Fit]{links(entry)}")
+            if position:
+                body += f" /Prev {siblings[position - 1]['number']} 0 R"
+            if position < len(siblings) - 1:
+                body += f" /Next {siblings[position + 1]['number']} 0 R"
+            objects.set(entry["number"], body + " >>")
+        objects.set(root, f"<< /Type /Outlines{links(parents[0])} >>")
+        return root
+
+
+def _bookmarks(plan):
+    """(title, level, page index) for every Bookmark in a plan, in page order"""
+    return [
+        (item.title, item.level, number)
+        for number, page in enumerate(plan.pages)
+        for item in page.items
+        if isinstance(item, Bookmark)
+    ]
+
+
+def write_plan(plan, title=None, outline=False, shared_chrome=False):
+    """PDF bytes for a LayoutPlan; shared_chrome puts repeated chrome in form XObjects"""
+    writer = _Writer(shared_chrome)
+    pages = [writer.content(page.items) for page in plan.pages]
+    return writer.output(pages, PAGE_SIZE, _bookmarks(plan), title, outline)
+
+
+def write_imposed(plan, imposition, title=None, outline=False):
+    """PDF bytes for a LayoutPlan imposed onto printer sheets, each page written once as a form"""
+    sheet_size, slots = SHEETS[imposition]
+    writer = _Writer(shared_chrome=True)
+    forms = [writer.form(writer.content(page.items)) for page in plan.pages]
+    sides = sheet_sides(plan.page_count, imposition)
+    side_of = {}
+    pages = []
+    for number, side in enumerate(sides):
+        ops = []
+        for slot, page in side:
+            place = slots[slot]
+            ops.append(f"q {_number(place.scale)} 0 0 {_number(place.scale)} {_number(place.x)} {_number(place.y)} cm "
+                       f"/{forms[page]} Do Q")
+            side_of[page] = number
+        pages.append("\n".join(ops))
+    bookmarks = [(name, level, side_of[page]) for name, level, page in _bookmarks(plan)]
+    return writer.output(pages, sheet_size, bookmarks, title, outline)
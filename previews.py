@@ -0,0 +1,207 @@
+# previews.py - Worksheet previews shown in the app, and a bounded cache of them
+#
+# A preview is keyed by its full WorksheetRequest, seed included, so changing
+# a setting and changing it back finds the earlier preview again. A request
+# without a seed keeps the last random preview for those settings. Previews
+# only go stale when the problem catalog is rebuilt, which drops them all.
+#
+# The preview shows the worksheet's pages as text, read from the same layout
+# plan the PDF is drawn from, so it wraps, splits columns and breaks pages
+# exactly as the printout does.
+#
+# A PreviewPrewarmer fills the cache ahead of time: previews for the checked
+# standards are built on a small thread pool shared by every session while
+# the teacher keeps working. Generation never touches generator state, so the
+# session's generator is shared with the pool.
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from layout import Chrome, Text, plan_answer_key, plan_worksheet
+from textmetrics import text_width
+
+# Previews kept per session before the least recently viewed is dropped
+PREVIEW_CACHE_SIZE = 64
+# Threads building previews in the background, shared by every session
+PREWARM_THREADS = 2
+# Page points per character of preview text, and the left margin it starts from
+PREVIEW_POINTS_PER_CHAR = 5
+PREVIEW_MARGIN = 50
+
+
+@dataclass(frozen=True)
+class Preview:
+    """What the app shows for a preview: problems, riddle, seed, printed page counts and the worksheet's page text"""
+    problems: tuple
+    riddle: tuple
+    seed: int
+    worksheet_pages: int
+    answer_pages: int
+    pages: tuple = ()
+
+
+def _plan_texts(items, x=0, y=0):
+    """(left x, baseline y, text) for every Text in items, Chrome placements included"""
+    for item in items:
+        if isinstance(item, Text):
+            left = item.x - text_width(item.text, item.font, item.size) / 2 if item.align == "centre" else item.x
+            yield x + left, y + item.y, item.text
+        elif isinstance(item, Chrome):
+            yield from _plan_texts(item.items, x + item.x, y + item.y)
+
+
+def page_lines(plan):
+    """Each page of a LayoutPlan as lines of text, top to bottom, each text at the column its x position maps to"""
+    pages = []
+    for page in plan.pages:
+        baselines = {}
+        for x, y, text in _plan_texts(page.items):
+            baselines.setdefault(round(y), []).append((x, text))
+        lines = []
+        for y in sorted(baselines, reverse=True):
+            line = ""
+            for x, text in sorted(baselines[y]):
+                column = max(0, round((x - PREVIEW_MARGIN) / PREVIEW_POINTS_PER_CHAR))
+                line += " " * max(column - len(line), 1 if line else 0) + text
+            lines.append(line)
+        pages.append(tuple(lines))
+    return tuple(pages)
+
+
+def build_preview(generator, request):
+    """Generate request with generator and lay it out as it prints; raises ValueError like generate"""
+    worksheet = generator.generate(request)
+    plan = plan_worksheet(worksheet)
+    return Preview(
+        worksheet.problems,
+        worksheet.riddle,
+        worksheet.seed,
+        plan.page_count,
+        plan_answer_key(worksheet).page_count,
+        page_lines(plan)
+    )
+
+
+class PreviewCache:
+    """Previews by WorksheetRequest, least recently used dropped past max_entries"""
+
+    def __init__(self, catalog=None, max_entries=PREVIEW_CACHE_SIZE):
+        self.catalog = catalog
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._previews = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, request):
+        return request in self._previews
+
+    def __len__(self):
+        return len(self._previews)
+
+    def get(self, request):
+        """Cached Preview for request, or None"""
+        with self._lock:
+            preview = self._previews.get(request)
+            if preview is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._previews.move_to_end(request)
+            return preview
+
+    def put(self, request, preview):
+        """Cache preview under request, dropping the least recently used past max_entries"""
+        with self._lock:
+            self._previews[request] = preview
+            self._previews.move_to_end(request)
+            while len(self._previews) > self.max_entries:
+                self._previews.popitem(last=False)
+
+    def use_catalog(self, catalog):
+        """Drop every preview when catalog is not the one they were generated from"""
+        with self._lock:
+            if catalog is not self.catalog:
+                self._previews.clear()
+                self.catalog = catalog
+
+    def clear(self):
+        with self._lock:
+            self._previews.clear()
+
+    @property
+    def hit_rate(self):
+        """Fraction of lookups answered from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """Size, capacity and lookups so far"""
+        return {
+            "previews": len(self._previews),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+        }
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """Thread pool shared by every session's prewarmer, started on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(PREWARM_THREADS, thread_name_prefix="preview")
+        return _executor
+
+
+class PreviewPrewarmer:
+    """Builds previews for requests in the background and puts them in a PreviewCache"""
+
+    def __init__(self, cache, generator):
+        self.cache = cache
+        self.generator = generator
+        self.completed = 0
+        self._pending = {}
+        # Requests that cannot be generated (e.g. too few problems in the bank); never retried
+        self._failed = set()
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self):
+        """Previews queued or being built"""
+        return len(self._pending)
+
+    def submit(self, requests):
+        """Queue a preview for each request not already cached, queued or known to fail"""
+        executor = _get_executor()
+        with self._lock:
+            for request in requests:
+                if request in self.cache or request in self._pending or request in self._failed:
+                    continue
+                self._pending[request] = executor.submit(self._build, request)
+
+    def _build(self, request):
+        try:
+            preview = build_preview(self.generator, request)
+        except ValueError:
+            preview = None
+        with self._lock:
+            if preview is not None and preview.problems:
+                self.cache.put(request, preview)
+            else:
+                self._failed.add(request)
+            self._pending.pop(request, None)
+            self.completed += 1
+
+    def cancel(self):
+        """Drop queued previews; ones already being built still finish"""
+        with self._lock:
+            for request, future in list(self._pending.items()):
+                if future.cancel():
+                    del self._pending[request]
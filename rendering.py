@@ -0,0 +1,261 @@
+# rendering.py - PDF rendering for Worksheet values
+#
+# Renderers only read the Worksheet they are given, so any number of threads
+# or worker processes can render concurrently without sharing state.
+#
+# Pages are laid out by layout.py; this module only replays LayoutPlans onto
+# a ReportLab canvas. Static chrome (name/date lines, standard header, riddle
+# instructions and answer grid) goes through a chrome object: InlineChrome for
+# one-worksheet PDFs, FormCache when one document holds many worksheets and
+# the chrome repeats.
+#
+# Every render function takes a backend: "reportlab" (the default) draws
+# through a ReportLab canvas, "native" writes the same plan with pdfwriter.py,
+# which is several times faster for large class-set runs.
+#
+# Both backends are byte-reproducible (no timestamps or random document IDs),
+# so the same worksheet always renders to the same bytes and can be cached.
+import io
+from reportlab.pdfgen import canvas
+
+import pdfwriter
+from textmetrics import text_runs, text_width
+
+from imposition import SHEETS, sheet_sides
+from layout import (
+    PAGE_SIZE, Bookmark, Chrome, Rect, Rule, Text,
+    plan_answer_grid, plan_answer_key, plan_combined, plan_worksheet
+)
+
+
+class InlineChrome:
+    """Draws static page chrome directly at every placement
+
+    Used for single-worksheet PDFs, where each piece of chrome appears once
+    and a form XObject would only add its own object overhead.
+    """
+
+    def __init__(self, c):
+        self.canvas = c
+
+    def place(self, key, draw, x=0, y=0):
+        """Draw draw(canvas) with its origin moved to (x, y)"""
+        c = self.canvas
+        c.saveState()
+        c.translate(x, y)
+        draw(c)
+        c.restoreState()
+
+
+class FormCache:
+    """Static page chrome as PDF form XObjects, defined once per canvas and placed by reference
+
+    Each key is drawn the first time it is placed; every later placement in
+    the same document is a single Do operator on the shared form. Use it for
+    documents holding several worksheets.
+    """
+
+    def __init__(self, c):
+        self.canvas = c
+        self._names = {}
+
+    def define(self, key, draw):
+        """Name of the form for key, defining it with draw(canvas) on first use"""
+        name = self._names.get(key)
+        if name is None:
+            c = self.canvas
+            name = f"C{len(self._names)}"
+            width, height = PAGE_SIZE
+            # Bounding box covers content drawn below a translated origin too
+            c.beginForm(name, 0, -height, width, height)
+            draw(c)
+            c.endForm()
+            self._names[key] = name
+        return name
+
+    def place(self, key, draw, x=0, y=0):
+        """Draw the form for key at (x, y), defining it with draw(canvas) on first use"""
+        c = self.canvas
+        c.saveState()
+        name = self.define(key, draw)
+        c.translate(x, y)
+        c.doForm(name)
+        c.restoreState()
+
+
+def _set_font(c, font, size):
+    if (c._fontname, c._fontsize) != (font, size):
+        c.setFont(font, size)
+
+
+def _chrome_drawer(chrome, forms):
+    return lambda c: _draw_items(c, chrome.items, forms)
+
+
+def _draw_runs(c, item, runs):
+    """Draw text whose runs switch between a font and its fallback face"""
+    x = item.x - text_width(item.text, item.font, item.size) / 2 if item.align == "centre" else item.x
+    text = c.beginText(x, item.y)
+    for font, run in runs:
+        text.setFont(font, item.size)
+        text.textOut(run)
+    # Leave the page's font as the canvas believes it is
+    text.setFont(item.font, item.size)
+    c.drawText(text)
+
+
+def _draw_items(c, items, forms):
+    for index, item in enumerate(items):
+        if isinstance(item, Text):
+            _set_font(c, item.font, item.size)
+            runs = text_runs(item.text, item.font)
+            if len(runs) > 1 or runs and runs[0][0] != item.font:
+                _draw_runs(c, item, runs)
+            elif item.align == "centre":
+                c.drawCentredString(item.x, item.y, item.text)
+            else:
+                c.drawString(item.x, item.y, item.text)
+        elif isinstance(item, Rect):
+            c.rect(item.x, item.y, item.width, item.height)
+        elif isinstance(item, Rule):
+            c.line(item.x1, item.y1, item.x2, item.y2)
+        elif isinstance(item, Chrome):
+            forms.place(item.key, _chrome_drawer(item, forms), item.x, item.y)
+        elif isinstance(item, Bookmark):
+            key = f"b{c.getPageNumber()}.{index}"
+            c.bookmarkPage(key)
+            c.addOutlineEntry(item.title, key, level=item.level)
+
+
+def draw_plan(c, plan, forms):
+    """Replay a LayoutPlan onto canvas c, starting on its current page"""
+    for number, page in enumerate(plan.pages):
+        if number:
+            c.showPage()
+        _draw_items(c, page.items, forms)
+
+
+def draw_worksheet(c, worksheet, forms):
+    """Draw the student worksheet onto canvas c, starting on its current page"""
+    draw_plan(c, plan_worksheet(worksheet), forms)
+
+
+def draw_answer_key(c, worksheet, forms):
+    """Draw the answer key onto canvas c, starting on its current page"""
+    draw_plan(c, plan_answer_key(worksheet), forms)
+
+
+BACKENDS = ("reportlab", "native")
+
+
+def _check_backend(backend):
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {', '.join(BACKENDS)}, not {backend!r}")
+
+
+def render_plan(plan, chrome=InlineChrome, title=None, outline=False, backend="reportlab"):
+    """PDF bytes for a LayoutPlan; chrome is InlineChrome or FormCache"""
+    _check_backend(backend)
+    if backend == "native":
+        return pdfwriter.write_plan(plan, title, outline, shared_chrome=chrome is FormCache)
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=PAGE_SIZE, invariant=True)
+    if title:
+        c.setTitle(title)
+    draw_plan(c, plan, chrome(c))
+    if outline:
+        c.showOutline()
+    c.save()
+    return buffer.getvalue()
+
+
+def render_imposed(plan, imposition, title=None, outline=False, backend="reportlab"):
+    """PDF bytes for a LayoutPlan imposed onto printer sheets ('2up', '4up' or 'booklet')
+
+    Each page is drawn once, as a form XObject, and every sheet places its
+    pages by reference. Chrome forms are shared across all pages, and
+    bookmarks point at the sheet a page lands on.
+    """
+    _check_backend(backend)
+    if backend == "native":
+        return pdfwriter.write_imposed(plan, imposition, title, outline)
+    sheet_size, slots = SHEETS[imposition]
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=sheet_size, invariant=True)
+    if title:
+        c.setTitle(title)
+    forms = FormCache(c)
+    pages = []
+    for number, page in enumerate(plan.pages):
+        # Forms cannot be defined while another is open, so chrome goes first
+        for item in page.items:
+            if isinstance(item, Chrome):
+                forms.define(item.key, _chrome_drawer(item, forms))
+        name = f"P{number}"
+        c.beginForm(name, 0, 0, *PAGE_SIZE)
+        _draw_items(c, [item for item in page.items if not isinstance(item, Bookmark)], forms)
+        c.endForm()
+        pages.append((name, [item for item in page.items if isinstance(item, Bookmark)]))
+
+    for side in sheet_sides(plan.page_count, imposition):
+        for slot, page in side:
+            name, bookmarks = pages[page]
+            c.saveState()
+            c.translate(slots[slot].x, slots[slot].y)
+            c.scale(slots[slot].scale, slots[slot].scale)
+            c.doForm(name)
+            c.restoreState()
+            for index in range(len(bookmarks)):
+                c.bookmarkPage(f"p{page}.{index}")
+        c.showPage()
+    # Outline entries in page order, even where a booklet puts pages out of order
+    for page, (name, bookmarks) in enumerate(pages):
+        for index, bookmark in enumerate(bookmarks):
+            c.addOutlineEntry(bookmark.title, f"p{page}.{index}", level=bookmark.level)
+    if outline:
+        c.showOutline()
+    c.save()
+    return buffer.getvalue()
+
+
+def render_worksheet_pdf(worksheet, backend="reportlab"):
+    """Create the student worksheet PDF"""
+    return render_plan(plan_worksheet(worksheet), backend=backend)
+
+
+def render_answer_key_pdf(worksheet, backend="reportlab"):
+    """Create the answer key PDF"""
+    return render_plan(plan_answer_key(worksheet), backend=backend)
+
+
+RENDERERS = {
+    "worksheet": render_worksheet_pdf,
+    "answer": render_answer_key_pdf,
+}
+ARTIFACTS = tuple(RENDERERS)
+ARTIFACT_TITLES = {"worksheet": "Worksheets", "answer": "Answer Keys"}
+
+
+def render_combined_pdf(worksheets, artifact, backend="reportlab"):
+    """One PDF holding an artifact for every worksheet, with a bookmark per standard and version
+
+    The whole document shares one canvas, so fonts and the form XObjects for
+    the static chrome are written once rather than once per worksheet.
+    """
+    return render_plan(plan_combined(worksheets, artifact), FormCache, ARTIFACT_TITLES[artifact], outline=True,
+                       backend=backend)
+
+
+def render_answer_grid_pdf(worksheets, backend="reportlab"):
+    """Consolidated answer key: one versions x problems grid per standard, riddle letters under answers"""
+    return render_plan(plan_answer_grid(worksheets), title="Answer Key", backend=backend)
+
+
+def render_artifact(worksheet, artifact, backend="reportlab"):
+    """Create one PDF: 'worksheet' or 'answer'"""
+    return RENDERERS[artifact](worksheet, backend)
+
+
+def render_pdfs(worksheet):
+    """Create PDF worksheet and answer key"""
+    return render_worksheet_pdf(worksheet), render_answer_key_pdf(worksheet)
@@ -0,0 +1,528 @@
+# server.py - Local HTTP service for worksheet generation
+#
+#     python server.py --port 8000 --workers 4 --max-concurrent 8 --timeout 60
+#
+#     GET  /health      liveness check
+#     GET  /standards   standard codes by grade and domain
+#     GET  /stats       request counts, p50/p99 latency and PDF cache hit rate
+#     POST /worksheet   {"standard": "6.RP.A.1", "problems": 8, "riddles": true,
+#                        "seed": 42, "version": 1, "columns": 1, "format": "pdf|answer|zip|json"}
+#     POST /batch       {"grade": "6", "standards": ["6.RP.A.1"] or "all", "versions": 3,
+#                        "problems": 8, "riddles": true, "seed": 42, "columns": 1,
+#                        "format": "both|worksheet|answer|json",
+#                        "layout": "separate|standard|batch", "compact_key": false,
+#                        "imposition": "none|2up|4up|booklet"}
+#
+# A /batch body may give "roster": ["Ada Lovelace", ...] instead of "versions"
+# for a class set: one worksheet per student, named and no two alike. The
+# class is scheduled on the pool too, and the most problems two students
+# share comes back as X-Most-Shared-Problems (or "most_shared" per standard in
+# JSON).
+#
+# /batch answers with a ZIP, or with the PDF itself when only one file results
+# (for example layout "batch" with format "worksheet" or "answer").
+#
+# Generation and rendering run on the shared process pool from batch.py, so
+# request threads only parse JSON and wait. At most --max-concurrent requests
+# are admitted at once; a request that cannot get a slot within --queue-timeout
+# gets 503 so a load balancer can retry elsewhere instead of queueing behind
+# slow work. PDFs go through the on-disk artifact cache (see artifact_cache.py)
+# unless --no-cache is given.
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from artifact_cache import cache_from_env
+from batch import (
+    batch_requests, default_workers, get_executor, render_cached, render_document, result_documents, run_task,
+    schedule_task, with_pdfs
+)
+from catalog import COMMON_CORE_STANDARDS, GRADES, RIDDLE_COMPATIBLE_STANDARDS, find_standard
+from classsets import ClassSet
+from exports import (
+    LAYOUTS, OUTPUT_FORMATS, check_imposition, generation_artifacts, output_files, plan_documents, prerendered,
+    zip_bytes
+)
+from imposition import IMPOSITIONS
+from layout import COLUMNS
+from rendering import BACKENDS
+from worksheet_generator import WorksheetRequest, new_seed
+
+MAX_BODY_BYTES = 64 * 1024
+MAX_PROBLEMS = 50
+MAX_BATCH_WORKSHEETS = 500
+MAX_RIDDLE_PROBLEMS = 15
+# /worksheet formats and the PDFs each one renders
+WORKSHEET_FORMATS = {
+    "pdf": ("worksheet",),
+    "answer": ("answer",),
+    "zip": ("worksheet", "answer"),
+    "json": (),
+}
+LATENCY_WINDOW = 1000
+
+
+class RequestError(Exception):
+    """Client error carrying the HTTP status to answer with"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class LatencyStats:
+    """Rolling window of request latencies, safe to update from handler threads"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self._latencies = deque(maxlen=window)
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, status, seconds):
+        with self._lock:
+            self._latencies.append(seconds)
+            self._counts[status] = self._counts.get(status, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            counts = dict(self._counts)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            index = min(len(latencies) - 1, int(p / 100 * len(latencies)))
+            return round(latencies[index] * 1000, 2)
+
+        return {
+            "requests": sum(counts.values()),
+            "by_status": {str(status): count for status, count in sorted(counts.items())},
+            "window": len(latencies),
+            "p50_ms": percentile(50),
+            "p99_ms": percentile(99),
+        }
+
+
+def _int_field(payload, name, default, low, high):
+    value = payload.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, int) or not low <= value <= high:
+        raise RequestError(400, f"{name} must be an integer from {low} to {high}")
+    return value
+
+
+def _seed_field(payload):
+    seed = payload.get("seed")
+    if seed is None:
+        return new_seed()
+    if isinstance(seed, bool) or not isinstance(seed, int) or seed < 0:
+        raise RequestError(400, "seed must be a non-negative integer")
+    return seed
+
+
+def _bool_field(payload, name, default):
+    value = payload.get(name, default)
+    if not isinstance(value, bool):
+        raise RequestError(400, f"{name} must be true or false")
+    return value
+
+
+def _riddles_field(payload, num_problems):
+    """Riddles where asked for and possible, as in the CLI"""
+    return _bool_field(payload, "riddles", True) and num_problems <= MAX_RIDDLE_PROBLEMS
+
+
+def _columns_field(payload):
+    columns = payload.get("columns", 1)
+    if columns not in COLUMNS or isinstance(columns, bool):
+        raise RequestError(400, f"columns must be one of {', '.join(map(str, COLUMNS))}")
+    return columns
+
+
+def _grade_field(payload):
+    value = str(payload.get("grade", ""))
+    for key, grade in GRADES.items():
+        if value in (key, grade, f"{key}th"):
+            return grade
+    raise RequestError(400, f"grade must be one of {', '.join(GRADES)}")
+
+
+def parse_worksheet(payload):
+    """WorksheetRequest and output format for a /worksheet body"""
+    code = payload.get("standard")
+    grade, _ = find_standard(code) if isinstance(code, str) else (None, "")
+    if grade is None:
+        raise RequestError(400, f"unknown standard {code!r}")
+    num_problems = _int_field(payload, "problems", 8, 3, MAX_PROBLEMS)
+    output_format = payload.get("format", "pdf")
+    if output_format not in WORKSHEET_FORMATS:
+        raise RequestError(400, f"format must be one of {', '.join(WORKSHEET_FORMATS)}")
+    request = WorksheetRequest(
+        code,
+        num_problems,
+        _riddles_field(payload, num_problems) and code in RIDDLE_COMPATIBLE_STANDARDS,
+        seed=_seed_field(payload),
+        version=_int_field(payload, "version", 1, 1, 10**6),
+        grade=grade,
+        columns=_columns_field(payload)
+    )
+    return request, output_format
+
+
+def parse_batch(payload):
+    """Requests (a ClassSet for a roster), output format, layout, compact_key, imposition and batch seed for /batch"""
+    grade = _grade_field(payload)
+    available = [code for standards in COMMON_CORE_STANDARDS[grade].values() for code in standards]
+    standards = payload.get("standards", "all")
+    if standards == "all" or standards == ["all"]:
+        standards = available
+    if not isinstance(standards, list) or not standards:
+        raise RequestError(400, "standards must be a list of codes or 'all'")
+    unknown = [code for code in standards if code not in available]
+    if unknown:
+        raise RequestError(400, f"not {grade} standards: {', '.join(map(str, unknown))}")
+    roster = payload.get("roster")
+    if roster is not None and (not isinstance(roster, list) or not roster
+                               or not all(isinstance(name, str) and name.strip() for name in roster)):
+        raise RequestError(400, "roster must be a list of student names")
+    versions = len(roster) if roster is not None else _int_field(payload, "versions", 1, 1, MAX_BATCH_WORKSHEETS)
+    if len(standards) * versions > MAX_BATCH_WORKSHEETS:
+        raise RequestError(400, f"a batch may hold at most {MAX_BATCH_WORKSHEETS} worksheets")
+    num_problems = _int_field(payload, "problems", 8, 3, MAX_PROBLEMS)
+    output_format = payload.get("format", "both")
+    if output_format not in OUTPUT_FORMATS + ("json",):
+        raise RequestError(400, f"format must be one of {', '.join(OUTPUT_FORMATS + ('json',))}")
+    layout = payload.get("layout", "separate")
+    if layout not in LAYOUTS:
+        raise RequestError(400, f"layout must be one of {', '.join(LAYOUTS)}")
+    imposition = payload.get("imposition", "none")
+    if imposition not in IMPOSITIONS:
+        raise RequestError(400, f"imposition must be one of {', '.join(IMPOSITIONS)}")
+    try:
+        check_imposition(layout, imposition)
+    except ValueError as e:
+        raise RequestError(400, str(e))
+    batch_seed = _seed_field(payload)
+    if roster is not None:
+        try:
+            requests = ClassSet(
+                tuple(name.strip() for name in roster),
+                tuple(standards),
+                num_problems,
+                _riddles_field(payload, num_problems),
+                grade=grade,
+                batch_seed=batch_seed,
+                columns=_columns_field(payload)
+            )
+        except ValueError as e:
+            raise RequestError(400, str(e))
+    else:
+        requests = batch_requests(
+            standards,
+            versions,
+            num_problems,
+            _riddles_field(payload, num_problems),
+            grade=grade,
+            batch_seed=batch_seed,
+            columns=_columns_field(payload)
+        )
+    return requests, output_format, layout, _bool_field(payload, "compact_key", False), imposition, batch_seed
+
+
+def worksheet_json(worksheet):
+    """JSON-ready view of a Worksheet"""
+    return {
+        "standard": worksheet.standard_code,
+        "standard_name": worksheet.standard_name,
+        "grade": worksheet.grade,
+        "version": worksheet.version,
+        "student": worksheet.student,
+        "seed": worksheet.seed,
+        "batch_seed": worksheet.batch_seed,
+        "problems": [{"problem": problem, "answer": answer} for problem, answer in worksheet.problems],
+        "riddle": None if worksheet.riddle is None else {
+            "question": worksheet.riddle[0],
+            "answer": worksheet.riddle[1],
+        },
+        "letter_mapping": worksheet.letter_mapping,
+    }
+
+
+class WorksheetService:
+    """Admission control and pooled generation shared by every handler thread"""
+
+    def __init__(self, workers=None, max_concurrent=None, timeout=60.0, queue_timeout=1.0, backend="reportlab",
+                 cache=None):
+        self.workers = workers or default_workers()
+        self.backend = backend
+        self.cache = cache
+        self.max_concurrent = max_concurrent or self.workers * 2
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.stats = LatencyStats()
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+
+    def admit(self):
+        """Take a concurrency slot, waiting up to queue_timeout; False when the service is saturated"""
+        return self._slots.acquire(timeout=self.queue_timeout)
+
+    def release(self):
+        self._slots.release()
+
+    def deadline(self):
+        """Monotonic time by which a request admitted now must finish"""
+        return time.monotonic() + self.timeout
+
+    def _wait(self, futures, deadline):
+        done, pending = wait(futures, timeout=max(0, deadline - time.monotonic()))
+        if pending:
+            # Tasks already running finish in the background; queued ones are dropped
+            for future in pending:
+                future.cancel()
+            raise RequestError(504, f"generation took longer than {self.timeout:g}s")
+        return [future.result() for future in futures]
+
+    def run(self, requests, artifacts, deadline):
+        """BatchResults in request order with the given PDFs rendered, or RequestError(504) past the deadline"""
+        executor = get_executor(self.workers)
+        if self.cache is None or not artifacts:
+            return self._wait([executor.submit(run_task, request, artifacts, self.backend) for request in requests],
+                              deadline)
+        # Generate only; the PDFs come from the cache or are rendered through it
+        results = self._wait([executor.submit(run_task, request, (), self.backend) for request in requests], deadline)
+        documents = result_documents(results, artifacts)
+        return with_pdfs(results, documents, self.render(documents, deadline))
+
+    def schedule(self, class_set, deadline):
+        """(requests, most shared problems by standard) for a ClassSet, scheduled on the pool
+
+        Raises RequestError(400) when the class cannot be scheduled, or 504 past the deadline.
+        """
+        future = get_executor(self.workers).submit(schedule_task, class_set)
+        try:
+            return self._wait([future], deadline)[0]
+        except ValueError as e:
+            raise RequestError(400, str(e))
+
+    def render(self, documents, deadline):
+        """PDF bytes for exports.Documents in order, or RequestError(504) past the deadline"""
+        executor = get_executor(self.workers)
+
+        def render(missing, cached=0):
+            return self._wait([executor.submit(render_document, document, self.backend) for document in missing],
+                              deadline)
+
+        if self.cache is None:
+            return render(documents)
+        return render_cached(documents, self.backend, self.cache, render)
+
+    def snapshot(self):
+        """Request and latency stats, plus PDF cache stats when caching"""
+        stats = self.stats.snapshot()
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        return stats
+
+
+class WorksheetHandler(BaseHTTPRequestHandler):
+    server_version = "WorksheetService/1.0"
+    # Socket timeout so a slow or stalled client cannot hold a thread forever
+    timeout = 30
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def do_GET(self):
+        routes = {
+            "/health": lambda: {"status": "ok"},
+            "/standards": lambda: COMMON_CORE_STANDARDS,
+            "/stats": self.service.snapshot,
+        }
+        route = routes.get(self.path.split("?", 1)[0])
+        if route is None:
+            self._send_json(404, {"error": "not found"})
+        else:
+            self._send_json(200, route())
+
+    def do_POST(self):
+        routes = {"/worksheet": self._worksheet, "/batch": self._batch}
+        route = routes.get(self.path.split("?", 1)[0])
+        if route is None:
+            self._send_json(404, {"error": "not found"})
+            return
+
+        start = time.perf_counter()
+        try:
+            # Read the body first: answering before it is consumed resets the connection
+            payload = self._read_json()
+        except RequestError as e:
+            self._send_json(e.status, {"error": str(e)}, {"Connection": "close"})
+            self.close_connection = True
+            self.service.stats.record(e.status, time.perf_counter() - start)
+            return
+        if not self.service.admit():
+            self._send_json(503, {"error": "server busy"}, {"Retry-After": "1"})
+            self.service.stats.record(503, time.perf_counter() - start)
+            return
+
+        status = 500
+        try:
+            status = route(payload)
+        except RequestError as e:
+            status = e.status
+            self._send_json(e.status, {"error": str(e)})
+        except Exception as e:
+            self.log_error("generation failed: %r", e)
+            self._send_json(500, {"error": "internal error"})
+        finally:
+            self.service.release()
+            self.service.stats.record(status, time.perf_counter() - start)
+
+    def _worksheet(self, payload):
+        request, output_format = parse_worksheet(payload)
+        result, = self.service.run([request], WORKSHEET_FORMATS[output_format], self.service.deadline())
+        if result.error:
+            raise RequestError(422, result.error)
+
+        name = f"{request.standard_code}_v{request.version}"
+        if output_format == "json":
+            return self._send_json(200, worksheet_json(result.worksheet))
+        if output_format == "zip":
+            return self._send_file(zip_bytes(output_files([result])), "application/zip", f"{name}.zip")
+        if output_format == "answer":
+            return self._send_file(result.answer_pdf, "application/pdf", f"{name}_answer_key.pdf")
+        return self._send_file(result.worksheet_pdf, "application/pdf", f"{name}_worksheet.pdf")
+
+    def _batch(self, payload):
+        deadline = self.service.deadline()
+        requests, output_format, layout, compact_key, imposition, batch_seed = parse_batch(payload)
+        most_shared = None
+        if isinstance(requests, ClassSet):
+            requests, most_shared = self.service.schedule(requests, deadline)
+        artifacts = () if output_format == "json" else generation_artifacts(output_format, layout, compact_key,
+                                                                            imposition)
+        results = self.service.run(requests, artifacts, deadline)
+        failed = [
+            {"standard": result.request.standard_code, "version": result.request.version, "error": result.error}
+            for result in results if result.error
+        ]
+        if output_format == "json":
+            body = {
+                "seed": batch_seed,
+                "worksheets": [worksheet_json(result.worksheet) for result in results if not result.error],
+                "failed": failed,
+            }
+            if most_shared is not None:
+                body["most_shared"] = most_shared
+            return self._send_json(200, body)
+        if len(failed) == len(results):
+            raise RequestError(422, "; ".join(f"{f['standard']} v{f['version']}: {f['error']}" for f in failed))
+        headers = {"X-Batch-Seed": str(batch_seed), "X-Failed-Worksheets": str(len(failed))}
+        if most_shared is not None:
+            headers["X-Most-Shared-Problems"] = str(max(most_shared.values()))
+        documents = plan_documents([result.worksheet for result in results if not result.error],
+                                   output_format, layout, compact_key, imposition)
+        pdfs = prerendered(results)
+        missing = [document for document in documents if document.name not in pdfs]
+        for document, pdf in zip(missing, self.service.render(missing, deadline)):
+            pdfs[document.name] = pdf
+        files = [(document.name, pdfs[document.name]) for document in documents]
+        if len(files) == 1:
+            name, data = files[0]
+            return self._send_file(data, "application/pdf", name, headers)
+        return self._send_file(zip_bytes(files), "application/zip", f"worksheets_{batch_seed}.zip", headers)
+
+    def _read_json(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            raise RequestError(400, "bad Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise RequestError(413, f"request body over {MAX_BODY_BYTES} bytes")
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise RequestError(400, "body must be JSON")
+        if not isinstance(payload, dict):
+            raise RequestError(400, "body must be a JSON object")
+        return payload
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self._send(status, data, "application/json", headers)
+        return status
+
+    def _send_file(self, data, content_type, filename, headers=None):
+        headers = dict(headers or {}, **{"Content-Disposition": f'attachment; filename="{filename}"'})
+        self._send(200, data, content_type, headers)
+        return 200
+
+    def _send(self, status, data, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class WorksheetServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Listen backlog; the default of 5 resets connections under a burst of clients
+    request_queue_size = 128
+
+    def __init__(self, address, service):
+        super().__init__(address, WorksheetHandler)
+        self.service = service
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Serve worksheet generation over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="port to listen on (default 8000)")
+    parser.add_argument("--workers", type=int, default=default_workers(),
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--max-concurrent", type=int,
+                        help="requests admitted at once; more get 503 (default: 2 x workers)")
+    parser.add_argument("--timeout", type=float, default=60.0,
+                        help="seconds a request may spend generating before a 504 (default 60)")
+    parser.add_argument("--queue-timeout", type=float, default=1.0,
+                        help="seconds to wait for a free slot before a 503 (default 1)")
+    parser.add_argument("--backend", choices=BACKENDS, default="reportlab",
+                        help="PDF writer: reportlab (default) or native (faster, smaller files)")
+    parser.add_argument("--cache", action=argparse.BooleanOptionalAction, default=True,
+                        help="serve PDFs rendered before from the on-disk cache, configured by "
+                             "WORKSHEET_CACHE_DIR and WORKSHEET_CACHE_MB (default on)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        cache = cache_from_env() if args.cache else None
+    except ValueError as e:
+        raise SystemExit(f"error: {e}")
+    service = WorksheetService(args.workers, args.max_concurrent, args.timeout, args.queue_timeout, args.backend,
+                               cache)
+    # Start the pool before accepting traffic so the first requests do not pay for it
+    get_executor(service.workers)
+    server = WorksheetServer((args.host, args.port), service)
+    print(f"Serving on http://{args.host}:{server.server_port} with {service.workers} worker(s), "
+          f"{service.max_concurrent} concurrent request(s), {service.timeout:g}s timeout")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
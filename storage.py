@@ -0,0 +1,191 @@
+# storage.py - Per-session storage for rendered PDFs and archives
+#
+# Artifacts stay in memory until a session's total would pass its memory
+# ceiling; after that they are written to the session's own temporary
+# directory and read back only when downloaded. The directory is removed when
+# the store is closed, garbage collected, or the process exits. Each directory
+# records the process that owns it, and start-up sweeps only directories whose
+# owner has exited, so an idle session keeps its files however old they are.
+import io
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+
+from exports import write_zip
+
+SPOOL_PREFIX = "worksheets-"
+# Per-session memory ceiling, overridable with WORKSHEET_MEMORY_LIMIT_MB
+DEFAULT_MEMORY_LIMIT = 32 * 1024 * 1024
+# File in each spool directory holding its owner's process id
+OWNER_FILE = "owner.pid"
+# Spool directories with no owner recorded are assumed abandoned past this age
+STALE_SPOOL_SECONDS = 24 * 60 * 60
+
+
+def memory_limit_from_env():
+    """Memory ceiling in bytes from WORKSHEET_MEMORY_LIMIT_MB, or the default"""
+    value = os.environ.get("WORKSHEET_MEMORY_LIMIT_MB")
+    if not value:
+        return DEFAULT_MEMORY_LIMIT
+    try:
+        return max(0, int(float(value) * 1024 * 1024))
+    except ValueError:
+        raise ValueError(f"WORKSHEET_MEMORY_LIMIT_MB must be a number, got {value!r}")
+
+
+def _process_exists(pid):
+    """False only when no process has this id; True wherever that cannot be checked"""
+    if os.name == "nt":
+        # os.kill cannot probe a process on Windows without signalling it
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Someone else's process, or a check we may not make
+        return True
+    return True
+
+
+def _abandoned(path, cutoff):
+    """True when the spool directory's owner has exited, or no owner is recorded and it predates cutoff"""
+    try:
+        with open(os.path.join(path, OWNER_FILE)) as f:
+            pid = int(f.read())
+    except (OSError, ValueError):
+        return os.stat(path, follow_symlinks=False).st_mtime < cutoff
+    return pid != os.getpid() and not _process_exists(pid)
+
+
+def cleanup_stale_spools(max_age=STALE_SPOOL_SECONDS):
+    """Remove spool directories whose owning process has exited; returns how many were removed
+
+    Directories recording no owner are removed once older than max_age seconds.
+    """
+    removed = 0
+    cutoff = time.time() - max_age
+    root = tempfile.gettempdir()
+    for entry in os.scandir(root):
+        if not entry.name.startswith(SPOOL_PREFIX) or not entry.is_dir(follow_symlinks=False):
+            continue
+        try:
+            if _abandoned(entry.path, cutoff):
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+class ArtifactStore:
+    """Named blobs held in memory up to memory_limit bytes, spooled to disk beyond it"""
+
+    def __init__(self, memory_limit=None):
+        self.memory_limit = memory_limit_from_env() if memory_limit is None else memory_limit
+        self.memory_bytes = 0
+        self._memory = {}
+        self._spooled = {}
+        self._spool_dir = None
+        self._finalizer = None
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def spooled(self):
+        """True once anything has been written to disk"""
+        return bool(self._spooled)
+
+    def __contains__(self, name):
+        return name in self._memory or name in self._spooled
+
+    def __len__(self):
+        return len(self._memory) + len(self._spooled)
+
+    def size(self, name):
+        """Size in bytes of a stored artifact"""
+        if name in self._memory:
+            return len(self._memory[name])
+        return self._spooled[name][1]
+
+    def _path(self, name):
+        if self._spool_dir is None:
+            self._spool_dir = tempfile.mkdtemp(prefix=SPOOL_PREFIX)
+            self._finalizer = weakref.finalize(self, shutil.rmtree, self._spool_dir, True)
+            with open(os.path.join(self._spool_dir, OWNER_FILE), "w") as f:
+                f.write(str(os.getpid()))
+        # Artifact names are generated, but never let one escape the spool directory
+        return os.path.join(self._spool_dir, f"{next(self._counter)}_{os.path.basename(name)}")
+
+    def _fits(self, size):
+        return self.memory_bytes + size <= self.memory_limit
+
+    def put(self, name, data):
+        """Store data under name, in memory if it fits under the ceiling"""
+        with self._lock:
+            self._discard(name)
+            if self._fits(len(data)):
+                self._memory[name] = data
+                self.memory_bytes += len(data)
+                return
+            path = self._path(name)
+            with open(path, "wb") as f:
+                f.write(data)
+            self._spooled[name] = (path, len(data))
+
+    def put_zip(self, name, files, size_hint=0):
+        """Store a ZIP of (name, bytes) pairs, writing it straight to disk when it will not fit"""
+        with self._lock:
+            self._discard(name)
+            if self._fits(size_hint):
+                buffer = io.BytesIO()
+                write_zip(files, buffer)
+                data = buffer.getvalue()
+                self._memory[name] = data
+                self.memory_bytes += len(data)
+                return
+            path = self._path(name)
+            write_zip(files, path)
+            self._spooled[name] = (path, os.path.getsize(path))
+
+    def get(self, name):
+        """Stored bytes, read back from disk when spooled"""
+        if name in self._memory:
+            return self._memory[name]
+        path, _ = self._spooled[name]
+        with open(path, "rb") as f:
+            return f.read()
+
+    def open(self, name):
+        """Readable binary file object over a stored artifact"""
+        if name in self._memory:
+            return io.BytesIO(self._memory[name])
+        path, _ = self._spooled[name]
+        return open(path, "rb")
+
+    def _discard(self, name):
+        if name in self._memory:
+            self.memory_bytes -= len(self._memory.pop(name))
+        elif name in self._spooled:
+            path, _ = self._spooled.pop(name)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """Drop every artifact and remove the spool directory"""
+        with self._lock:
+            self._memory.clear()
+            self._spooled.clear()
+            self.memory_bytes = 0
+            if self._finalizer is not None:
+                self._finalizer()
+                self._finalizer = None
+                self._spool_dir = None
+
+    close = clear
@@ -0,0 +1,717 @@
+# templates.py - Seeded parametric problem templates
+#
+# Every template is a function ``template(rng, target=None)`` returning a
+# ``(problem, answer)`` tuple, or None when it cannot produce the requested
+# target answer. ``rng`` is an explicit ``random.Random``; templates never
+# touch the global ``random`` state. When ``target`` is given (a clean answer
+# string as produced by ``catalog.extract_numeric``) the template builds a
+# problem whose answer is exactly that value, which is how riddle letters get
+# as many matching problems as they need.
+from decimal import Decimal
+from fractions import Fraction
+from math import gcd, isqrt
+
+SUPERSCRIPTS = {2: "²", 3: "³", 4: "⁴", 5: "⁵", 6: "⁶"}
+
+
+def _int_target(target):
+    """Parse an integer target, or None if the target is not an integer"""
+    try:
+        return int(target)
+    except (TypeError, ValueError):
+        return None
+
+
+def _decimal_target(target):
+    """Parse a terminating decimal target as a Fraction, or None"""
+    try:
+        return Fraction(Decimal(target))
+    except (TypeError, ValueError, ArithmeticError):
+        return None
+
+
+def _fmt(value):
+    """Format an int or terminating Fraction the way the banks write answers"""
+    value = Fraction(value)
+    if value.denominator == 1:
+        return str(value.numerator)
+    text = format(Decimal(value.numerator) / Decimal(value.denominator), "f")
+    return text.rstrip("0").rstrip(".")
+
+
+def _paren(n):
+    """Wrap negative integers in parentheses, as in '(-5) + 8'"""
+    return f"({n})" if n < 0 else str(n)
+
+
+def _divisors(n, low=2, high=None):
+    """Divisors of n within [low, high]"""
+    n = abs(n)
+    high = n if high is None else min(high, n)
+    found = []
+    for d in range(1, isqrt(n) + 1):
+        if n % d == 0:
+            for candidate in (d, n // d):
+                if low <= candidate <= high and candidate not in found:
+                    found.append(candidate)
+    return found
+
+
+def _pick_positive(rng, target, low, high):
+    """Use a positive integer target, or draw one from [low, high] when untargeted"""
+    if target is None:
+        return rng.randint(low, high)
+    value = _int_target(target)
+    if value is None or value <= 0:
+        return None
+    return value
+
+
+def _pick_integer(rng, target, low, high):
+    """Use any integer target, or draw one from [low, high] when untargeted"""
+    if target is None:
+        return rng.randint(low, high)
+    return _int_target(target)
+
+
+def _pick_product(rng, target, low, high, factors=2):
+    """Use a positive integer target, or multiply draws from [low, high] when untargeted"""
+    if target is None:
+        value = 1
+        for _ in range(factors):
+            value *= rng.randint(low, high)
+        return value
+    return _pick_positive(rng, target, 1, 1)
+
+
+def _split_product(rng, value, low=2, high=None):
+    """Split value into a factor pair (a, value // a) with a in [low, high]"""
+    choices = [d for d in _divisors(value, low, high) if value // d >= low]
+    if not choices:
+        return None
+    a = rng.choice(choices)
+    return a, value // a
+
+
+def _data_set(rng, center, size):
+    """Positive data set of odd or even size whose mean is exactly center"""
+    offsets = []
+    for _ in range(size // 2):
+        d = rng.randint(1, min(9, center - 1)) if center > 1 else 0
+        offsets.extend((d, -d))
+    if size % 2:
+        offsets.append(0)
+    values = [center + d for d in offsets]
+    rng.shuffle(values)
+    return values
+
+
+# Ratios & Proportional Relationships
+
+def ratio_simplify(rng, target=None):
+    """Simplify the ratio a:b"""
+    if target is None:
+        a, b = rng.randint(1, 9), rng.randint(1, 9)
+        while a == b or gcd(a, b) != 1:
+            a, b = rng.randint(1, 9), rng.randint(1, 9)
+    else:
+        parts = str(target).split(":")
+        if len(parts) != 2 or _int_target(parts[0]) is None or _int_target(parts[1]) is None:
+            return None
+        a, b = int(parts[0]), int(parts[1])
+        if a <= 0 or b <= 0 or gcd(a, b) != 1:
+            return None
+    k = rng.randint(2, 9)
+    context = rng.choice([
+        "Simplify the ratio {x}:{y}",
+        "Ratio of {x} red to {y} blue marbles?",
+        "{x} cars to {y} trucks. Simplest form?",
+        "Class has {x} boys and {y} girls. Simplest ratio?",
+    ])
+    return context.format(x=a * k, y=b * k), f"{a}:{b}"
+
+
+def unit_rate(rng, target=None):
+    """Whole-number unit rate from a total and a count"""
+    rate = _pick_positive(rng, target, 2, 60)
+    if rate is None:
+        return None
+    n = rng.randint(2, 12)
+    context = rng.choice([
+        "Car travels {t} miles in {n} hours. Speed?",
+        "If {n} items cost ${t}, cost per item?",
+        "Read {t} pages in {n} minutes. Pages per minute?",
+        "Earn ${t} in {n} hours. Hourly rate?",
+        "Factory makes {t} items in {n} hours. Rate?",
+    ])
+    return context.format(t=rate * n, n=n), str(rate)
+
+
+PERCENTS = (5, 10, 20, 25, 40, 50, 60, 75, 80)
+
+
+def percent_of(rng, target=None):
+    """Find p% of w with a whole-number result"""
+    part = _pick_positive(rng, target, 2, 60)
+    if part is None:
+        return None
+    percent = rng.choice([p for p in PERCENTS if (part * 100) % p == 0])
+    whole = part * 100 // percent
+    if target is None and rng.random() < 0.5:
+        return f"{part} is what percent of {whole}?", str(percent)
+    return f"Find {percent}% of {whole}", str(part)
+
+
+def percent_discount(rng, target=None):
+    """Sale price after a whole-number percent discount"""
+    price = _pick_positive(rng, target, 10, 150)
+    if price is None:
+        return None
+    # Sale = original * (100 - p) / 100, so pick p whose remainder divides evenly
+    options = [p for p in (10, 20, 25, 50) if (price * 100) % (100 - p) == 0]
+    if not options:
+        return None
+    percent = rng.choice(options)
+    original = price * 100 // (100 - percent)
+    return f"${original} item, {percent}% off. Sale price?", str(price)
+
+
+def fraction_unit_rate(rng, target=None):
+    """Unit rate where the quantity is a unit fraction"""
+    rate = _pick_product(rng, target, 2, 8)
+    if rate is None:
+        return None
+    choices = _divisors(rate, 2, 8)
+    if not choices:
+        return None
+    d = rng.choice(choices)
+    amount = rate // d
+    context = rng.choice([
+        "Travel {a} miles in 1/{d} hour. Miles per hour?",
+        "If 1/{d} pound costs ${a}, cost per pound?",
+        "Paint {a} sq ft in 1/{d} hour. Sq ft per hour?",
+    ])
+    return context.format(a=amount, d=d), str(rate)
+
+
+def proportional_constant(rng, target=None):
+    """Constant of proportionality from a point on y = kx"""
+    k = _pick_positive(rng, target, 2, 12)
+    if k is None:
+        return None
+    x = rng.randint(2, 9)
+    return f"Graph through (0,0) and ({x},{k * x}). Find k", str(k)
+
+
+def scale_problem(rng, target=None):
+    """Scale drawings and recipe scaling"""
+    value = _pick_product(rng, target, 2, 15)
+    if value is None:
+        return None
+    pair = _split_product(rng, value, 2, 50)
+    if pair is None:
+        return None
+    scale, count = pair
+    if rng.random() < 0.5:
+        return f"Map: 1 inch = {scale} miles. {count} inches?", str(value)
+    return f"Recipe for 1 batch uses {scale} cups. For {count} batches?", str(value)
+
+
+# The Number System
+
+def fraction_division(rng, target=None):
+    """Whole number divided by a unit fraction"""
+    value = _pick_positive(rng, target, 4, 60)
+    if value is None:
+        return None
+    pair = _split_product(rng, value, 2, 9)
+    if pair is not None and rng.random() < 0.5:
+        d, whole = pair
+        return f"{whole} ÷ 1/{d}", str(value)
+    d = rng.randint(2, 12)
+    return f"{value}/{d} ÷ 1/{d}", str(value)
+
+
+def long_division(rng, target=None):
+    """Multi-digit division with a whole-number quotient"""
+    quotient = _pick_positive(rng, target, 11, 60)
+    if quotient is None:
+        return None
+    divisor = rng.randint(11, 45)
+    return f"{quotient * divisor} ÷ {divisor}", str(quotient)
+
+
+def decimal_operation(rng, target=None):
+    """Add or subtract tenths"""
+    if target is None:
+        result = Fraction(rng.randint(50, 900), 10)
+    else:
+        result = _decimal_target(target)
+        if result is None or result <= 1 or (result * 10).denominator != 1:
+            return None
+    tenths = int(result * 10)
+    if rng.random() < 0.5:
+        a = rng.randint(1, tenths - 1)
+        return f"{_fmt(Fraction(a, 10))} + {_fmt(Fraction(tenths - a, 10))}", _fmt(result)
+    b = rng.randint(11, 400)
+    return f"{_fmt(Fraction(tenths + b, 10))} - {_fmt(Fraction(b, 10))}", _fmt(result)
+
+
+def gcf_problem(rng, target=None):
+    """Greatest common factor of two multiples"""
+    g = _pick_positive(rng, target, 2, 20)
+    if g is None:
+        return None
+    m, n = rng.randint(1, 9), rng.randint(2, 9)
+    while m == n or gcd(m, n) != 1:
+        m, n = rng.randint(1, 9), rng.randint(2, 9)
+    return f"GCF of {g * m} and {g * n}", str(g)
+
+
+def lcm_problem(rng, target=None):
+    """Least common multiple of two small numbers"""
+    if target is not None:
+        return None
+    a, b = rng.randint(2, 15), rng.randint(2, 15)
+    while a == b:
+        b = rng.randint(2, 15)
+    return f"LCM of {a} and {b}", str(a * b // gcd(a, b))
+
+
+def integer_add_subtract(rng, target=None):
+    """Add or subtract integers, with at least one negative"""
+    result = _pick_integer(rng, target, -30, 30)
+    if result is None:
+        return None
+    a = rng.randint(-25, -1) if rng.random() < 0.7 else rng.randint(1, 25)
+    if rng.random() < 0.5:
+        return f"{_paren(a)} + {_paren(result - a)}", str(result)
+    return f"{_paren(a)} - {_paren(a - result)}", str(result)
+
+
+def number_line(rng, target=None):
+    """Moves, opposites and distances on the number line"""
+    result = _pick_integer(rng, target, -20, 20)
+    if result is None:
+        return None
+    kind = rng.randint(0, 2)
+    if kind == 0:
+        k = rng.randint(2, 12)
+        return f"Point {k} units left of {result + k}", str(result)
+    if kind == 1 and result != 0:
+        return f"Find the opposite of {-result}", str(result)
+    k = rng.randint(2, 12)
+    return f"Point {k} units right of {result - k}", str(result)
+
+
+def absolute_value(rng, target=None):
+    """Absolute values, alone or combined"""
+    result = _pick_positive(rng, target, 1, 40)
+    if result is None:
+        return None
+    if result < 2 or rng.random() < 0.5:
+        return f"Find |-{result}|", str(result)
+    a = rng.randint(1, result - 1)
+    return f"|-{a}| + |{result - a}|", str(result)
+
+
+def integer_multiply_divide(rng, target=None):
+    """Multiply or divide signed integers"""
+    result = _pick_integer(rng, target, -60, 60)
+    if result is None:
+        return None
+    if result != 0 and rng.random() < 0.5:
+        pair = _split_product(rng, abs(result), 2, 12)
+        if pair is not None:
+            a, b = pair
+            a = -a if rng.random() < 0.5 else a
+            b = b if (a > 0) == (result > 0) else -b
+            return f"{_paren(a)} × {_paren(b)}", str(result)
+    d = rng.choice([-9, -8, -7, -6, -5, -4, -3, -2, 2, 3, 4, 5, 6, 7, 8, 9])
+    return f"{_paren(result * d)} ÷ {_paren(d)}", str(result)
+
+
+def signed_word_problem(rng, target=None):
+    """Temperature, elevation and balance changes with signed results"""
+    result = _pick_integer(rng, target, -60, 40)
+    if result is None:
+        return None
+    if result < 0 and rng.random() < 0.5:
+        pair = _split_product(rng, -result, 2, 12)
+        if pair is not None:
+            rate, hours = pair
+            return f"Temperature drops {rate}° per hour for {hours} hours. Change?", str(result)
+    start = rng.randint(max(10, result + 5), max(10, result + 5) + 90)
+    if rng.random() < 0.5:
+        return f"Account: ${start}, spends ${start - result}. Balance?", str(result)
+    return f"Elevation: {start} ft, descends {start - result} ft. New?", str(result)
+
+
+# Expressions & Equations
+
+def exponent_problem(rng, target=None):
+    """Evaluate a power plus a constant"""
+    result = _pick_positive(rng, target, 10, 150)
+    if result is None:
+        return None
+    options = [(b, e) for b in range(2, 11) for e in (2, 3) if b ** e < result]
+    if not options:
+        return None
+    base, exp = rng.choice(options)
+    return f"Evaluate: {base}{SUPERSCRIPTS[exp]} + {result - base ** exp}", str(result)
+
+
+def evaluate_expression(rng, target=None):
+    """Evaluate ax + b (or ax - b) for a given x"""
+    result = _pick_positive(rng, target, 5, 80)
+    if result is None:
+        return None
+    a, x = rng.randint(2, 9), rng.randint(1, 10)
+    b = result - a * x
+    var = rng.choice("xyn")
+    if b > 0:
+        return f"Evaluate {a}{var} + {b} when {var} = {x}", str(result)
+    if b < 0:
+        return f"Evaluate {a}{var} - {-b} when {var} = {x}", str(result)
+    return f"Evaluate {a}{var} when {var} = {x}", str(result)
+
+
+def property_problem(rng, target=None):
+    """Name the property of operations shown"""
+    if target is not None:
+        return None
+    a, b, c = rng.randint(2, 12), rng.randint(2, 12), rng.randint(2, 12)
+    kind = rng.randint(0, 3)
+    if kind == 0:
+        return f"Which property: {a} + {b} = {b} + {a}?", "Commutative"
+    if kind == 1:
+        return f"Which property: ({a}+{b})+{c} = {a}+({b}+{c})?", "Associative"
+    if kind == 2:
+        return f"Which property: {a}(x + {b}) = {a}x + {a * b}?", "Distributive"
+    return f"Which property: {a * b} × 1 = {a * b}?", "Identity"
+
+
+def combine_like_terms(rng, target=None):
+    """Combine like terms in one variable"""
+    if target is not None:
+        return None
+    a, b, c = rng.randint(2, 12), rng.randint(1, 9), rng.randint(1, 9)
+    var = rng.choice("xyn")
+    if a > b:
+        return f"Simplify: {a}{var} - {b}{var} + {c}{var}", f"{a - b + c}{var}"
+    return f"Simplify: {a}{var} + {b}{var} + {c}{var}", f"{a + b + c}{var}"
+
+
+def expand_or_factor(rng, target=None):
+    """Expand a(x + b) or factor out the GCF"""
+    if target is not None:
+        return None
+    g = rng.randint(2, 9)
+    m, n = rng.randint(1, 6), rng.randint(1, 9)
+    while gcd(m, n) != 1:
+        m, n = rng.randint(1, 6), rng.randint(1, 9)
+    sign = rng.choice("+-")
+    inner = f"{m}x {sign} {n}" if m > 1 else f"x {sign} {n}"
+    if rng.random() < 0.5:
+        return f"Expand: {g}({inner})", f"{g * m}x {sign} {g * n}"
+    return f"Factor: {g * m}x {sign} {g * n}", f"{g}({inner})"
+
+
+def solution_check(rng, target=None):
+    """Decide whether a value solves a one-step equation"""
+    if target is not None:
+        return None
+    x, a = rng.randint(1, 12), rng.randint(2, 9)
+    c = a * x if rng.random() < 0.5 else a * x + rng.choice([-2, -1, 1, 2])
+    answer = "Yes" if c == a * x else "No"
+    return f"Is x = {x} a solution to {a}x = {c}?", answer
+
+
+def write_expression(rng, target=None):
+    """Translate a phrase into an algebraic expression"""
+    if target is not None:
+        return None
+    n, var = rng.randint(2, 20), rng.choice("nmxy")
+    kind = rng.randint(0, 2)
+    if kind == 0:
+        return f"Express: '{n} more than {var}'", f"{var} + {n}"
+    if kind == 1:
+        return f"Express: '{n} less than {var}'", f"{var} - {n}"
+    return f"Express: '{n} times {var}'", f"{n}{var}"
+
+
+def one_step_equation(rng, target=None):
+    """Solve x + a = b, x - a = b, ax = b or x/a = b"""
+    x = _pick_integer(rng, target, 2, 40)
+    if x is None:
+        return None
+    a = rng.randint(2, 12)
+    kind = rng.randint(0, 3)
+    if kind == 0:
+        return f"Solve: x + {a} = {x + a}", str(x)
+    if kind == 1:
+        return f"Solve: x - {a} = {x - a}", str(x)
+    if kind == 2 or x % a:
+        return f"Solve: {a}x = {a * x}", str(x)
+    return f"Solve: x/{a} = {x // a}", str(x)
+
+
+def two_step_equation(rng, target=None):
+    """Solve ax + b = c"""
+    x = _pick_integer(rng, target, 2, 20)
+    if x is None:
+        return None
+    a, b = rng.randint(2, 9), rng.randint(1, 15)
+    if rng.random() < 0.5:
+        return f"Solve: {a}x + {b} = {a * x + b}", str(x)
+    return f"Solve: {a}x - {b} = {a * x - b}", str(x)
+
+
+def variable_relationship(rng, target=None):
+    """Find y from y = kx or x from y = x + a"""
+    value = _pick_positive(rng, target, 2, 60)
+    if value is None:
+        return None
+    if rng.random() < 0.5:
+        a = rng.randint(2, 15)
+        return f"If y = x + {a}, and y = {value + a}, find x", str(value)
+    pair = _split_product(rng, value, 2, 9)
+    if pair is None:
+        a = rng.randint(2, 15)
+        return f"If y = x + {a}, and y = {value + a}, find x", str(value)
+    k, x = pair
+    return f"If y = {k}x, and x = {x}, find y", str(value)
+
+
+def rate_word_problem(rng, target=None):
+    """Real-world cost and time problems"""
+    value = _pick_product(rng, target, 2, 12)
+    if value is None:
+        return None
+    pair = _split_product(rng, value, 2, 25)
+    if pair is None:
+        return None
+    price, count = pair
+    if rng.random() < 0.5:
+        return f"Tickets cost ${price} each. Cost for {count}?", str(value)
+    return f"Earn ${price}/hour. Hours to earn ${price * value}?", str(value)
+
+
+# Geometry
+
+def area_problem(rng, target=None):
+    """Area of a rectangle, parallelogram or triangle"""
+    area = _pick_product(rng, target, 2, 12)
+    if area is None:
+        return None
+    if rng.random() < 0.5:
+        pair = _split_product(rng, 2 * area, 2, 30)
+        if pair is not None:
+            base, height = pair
+            return f"Triangle area: base = {base}, height = {height}", str(area)
+    pair = _split_product(rng, area, 2, 30)
+    if pair is None:
+        return None
+    length, width = pair
+    shape = rng.choice(["Rectangle area: length = {a}, width = {b}", "Parallelogram: base = {a}, height = {b}"])
+    return shape.format(a=length, b=width), str(area)
+
+
+def volume_problem(rng, target=None):
+    """Volume of a rectangular prism"""
+    volume = _pick_product(rng, target, 2, 12, factors=3)
+    if volume is None:
+        return None
+    first = _split_product(rng, volume, 2, 12)
+    if first is None:
+        return None
+    length, rest = first
+    second = _split_product(rng, rest, 2, 12)
+    if second is None:
+        return None
+    width, height = second
+    return f"Volume of box: {length} × {width} × {height}", str(volume)
+
+
+def coordinate_distance(rng, target=None):
+    """Distance between points sharing a coordinate"""
+    distance = _pick_positive(rng, target, 1, 15)
+    if distance is None:
+        return None
+    x, y = rng.randint(-5, 9), rng.randint(-5, 9)
+    if rng.random() < 0.5:
+        return f"Distance from ({x},{y}) to ({x},{y + distance})", str(distance)
+    return f"Distance from ({x},{y}) to ({x + distance},{y})", str(distance)
+
+
+def net_surface_area(rng, target=None):
+    """Surface area of a cube from its net"""
+    if target is None:
+        face = rng.randint(2, 50)
+    else:
+        total = _int_target(target)
+        if total is None or total <= 0 or total % 6:
+            return None
+        face = total // 6
+    return f"Cube net: 6 squares, each {face} sq units. Surface area?", str(6 * face)
+
+
+# Statistics & Probability
+
+def statistical_question(rng, target=None):
+    """Decide whether a question is statistical"""
+    if target is not None:
+        return None
+    thing = rng.choice(["pets", "siblings", "books", "hours of sleep", "pencils", "cousins"])
+    group = rng.choice(["students in our class", "7th graders", "families on our street", "players on the team"])
+    name = rng.choice(["Maya", "Leo", "Ana", "Sam", "Priya", "Omar"])
+    if rng.random() < 0.5:
+        return f"Is 'How many {thing} do {group} have?' statistical?", "Yes"
+    return f"Is 'How many {thing} does {name} have?' statistical?", "No"
+
+
+def mean_problem(rng, target=None):
+    """Mean of a small data set"""
+    mean = _pick_positive(rng, target, 4, 40)
+    if mean is None:
+        return None
+    values = _data_set(rng, mean, rng.choice([4, 5]))
+    return f"Find mean: {', '.join(map(str, values))}", str(mean)
+
+
+def median_problem(rng, target=None):
+    """Median of an odd-length data set"""
+    median = _pick_positive(rng, target, 3, 40)
+    if median is None:
+        return None
+    values = [rng.randint(1, median) for _ in range(2)] + [median] + [rng.randint(median, median + 15) for _ in range(2)]
+    rng.shuffle(values)
+    return f"Find median: {', '.join(map(str, values))}", str(median)
+
+
+def range_problem(rng, target=None):
+    """Range of a small data set"""
+    spread = _pick_positive(rng, target, 2, 30)
+    if spread is None:
+        return None
+    low = rng.randint(1, 20)
+    values = [low, low + spread] + [rng.randint(low, low + spread) for _ in range(3)]
+    rng.shuffle(values)
+    return f"Find range: {', '.join(map(str, values))}", str(spread)
+
+
+def frequency_total(rng, target=None):
+    """Count data points from frequency bins"""
+    total = _pick_positive(rng, target, 6, 40)
+    # Three bins of at least one value each
+    if total is None or total < 3:
+        return None
+    a = rng.randint(1, total - 2)
+    b = rng.randint(1, total - a - 1)
+    return f"Histogram bins hold {a}, {b} and {total - a - b} values. Total values?", str(total)
+
+
+def sample_prediction(rng, target=None):
+    """Predict a population count from a random sample"""
+    sample_size = rng.choice([10, 20, 25, 40, 50])
+    if target is None:
+        hits = rng.randint(1, sample_size - 1)
+        population = sample_size * rng.randint(5, 30)
+        prediction = hits * population // sample_size
+    else:
+        prediction = _int_target(target)
+        if prediction is None or prediction <= 0:
+            return None
+        # hits / sample_size = prediction / population, with a whole population
+        options = [h for h in range(1, sample_size) if (prediction * sample_size) % h == 0 and prediction * sample_size // h > sample_size]
+        if not options:
+            return None
+        hits = rng.choice(options)
+        population = prediction * sample_size // hits
+    return f"Random sample: {hits} of {sample_size} students like soccer. Predict for {population} students?", str(prediction)
+
+
+def compare_distributions(rng, target=None):
+    """Compare centers or spreads of two groups"""
+    difference = _pick_positive(rng, target, 1, 20)
+    if difference is None:
+        return None
+    a = rng.randint(5, 60)
+    if rng.random() < 0.5:
+        return f"Class A mean is {a + difference}, Class B mean is {a}. Difference of means?", str(difference)
+    return f"Team A range is {a}, Team B range is {a + difference}. How much greater is B's?", str(difference)
+
+
+def simple_probability(rng, target=None):
+    """Probability of drawing a color from a bag"""
+    if target is None:
+        total = rng.choice([2, 4, 5, 10, 20])
+        favorable = rng.randint(1, total - 1)
+    else:
+        p = _decimal_target(target)
+        if p is None or not 0 < p < 1:
+            return None
+        totals = [t for t in (2, 4, 5, 10, 20, 25, 50, 100) if (p * t).denominator == 1]
+        if not totals:
+            return None
+        total = rng.choice(totals)
+        favorable = int(p * total)
+    color, other = rng.sample(["red", "blue", "green", "yellow"], 2)
+    return f"Bag: {favorable} {color}, {total - favorable} {other}. P({color})?", _fmt(Fraction(favorable, total))
+
+
+def expected_count(rng, target=None):
+    """Expected count from a probability model"""
+    expected = _pick_positive(rng, target, 5, 100)
+    if expected is None:
+        return None
+    if rng.random() < 0.5:
+        return f"Coin flipped {expected * 2} times. Expected heads?", str(expected)
+    return f"Die rolled {expected * 6} times. Expected number of 4s?", str(expected)
+
+
+TEMPLATES = {
+    # 6th Grade
+    "6.RP.A.1": (ratio_simplify,),
+    "6.RP.A.2": (unit_rate,),
+    "6.RP.A.3": (percent_of, percent_discount),
+    "6.NS.A.1": (fraction_division,),
+    "6.NS.B.2": (long_division,),
+    "6.NS.B.3": (decimal_operation,),
+    "6.NS.B.4": (gcf_problem, lcm_problem),
+    "6.NS.C.5": (integer_add_subtract, signed_word_problem),
+    "6.NS.C.6": (number_line,),
+    "6.NS.C.7": (absolute_value,),
+    "6.EE.A.1": (exponent_problem,),
+    "6.EE.A.2": (evaluate_expression,),
+    "6.EE.A.3": (property_problem,),
+    "6.EE.A.4": (combine_like_terms, expand_or_factor),
+    "6.EE.B.5": (solution_check,),
+    "6.EE.B.6": (write_expression,),
+    "6.EE.B.7": (one_step_equation,),
+    "6.EE.C.9": (variable_relationship,),
+    "6.G.A.1": (area_problem,),
+    "6.G.A.2": (volume_problem,),
+    "6.G.A.3": (coordinate_distance,),
+    "6.G.A.4": (net_surface_area,),
+    "6.SP.A.1": (statistical_question,),
+    "6.SP.A.2": (range_problem, median_problem),
+    "6.SP.B.4": (frequency_total,),
+    "6.SP.B.5": (mean_problem, median_problem, range_problem),
+    # 7th Grade
+    "7.RP.A.1": (fraction_unit_rate,),
+    "7.RP.A.2": (proportional_constant,),
+    "7.RP.A.3": (scale_problem, percent_of, percent_discount),
+    "7.NS.A.1": (integer_add_subtract,),
+    "7.NS.A.2": (integer_multiply_divide,),
+    "7.NS.A.3": (signed_word_problem,),
+    "7.EE.A.1": (expand_or_factor,),
+    "7.EE.A.2": (combine_like_terms,),
+    "7.EE.B.3": (two_step_equation,),
+    "7.EE.B.4": (rate_word_problem,),
+    "7.SP.A.1": (mean_problem, range_problem),
+    "7.SP.A.2": (sample_prediction,),
+    "7.SP.B.3": (compare_distributions,),
+    "7.SP.C.5": (simple_probability,),
+    "7.SP.C.7": (expected_count,),
+}
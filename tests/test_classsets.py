@@ -0,0 +1,150 @@
+from itertools import combinations
+
+import pytest
+
+from batch import BatchJob
+from catalog import extract_numeric
+from classsets import (
+    MAX_SHARED, ClassSet, class_pool_size, class_set_requests, parse_roster, schedule_problems, shared_problems
+)
+from layout import _seed_line
+from worksheet_generator import MathWorksheetGenerator, WorksheetRequest
+
+ROSTER = tuple(f"Student {i}" for i in range(40))
+
+
+@pytest.fixture(scope="module")
+def generator():
+    return MathWorksheetGenerator()
+
+
+def brute_force_shared(requests):
+    shared = {}
+    for first, second in combinations(requests, 2):
+        if first.standard_code == second.standard_code:
+            common = len(set(first.problems) & set(second.problems))
+            shared[first.standard_code] = max(shared.get(first.standard_code, 0), common)
+    return shared
+
+
+def test_parse_roster_name_column():
+    assert parse_roster("Id,Name\n1,Ada Lovelace\n2,Alan Turing\n") == ("Ada Lovelace", "Alan Turing")
+
+
+def test_parse_roster_first_and_last_columns():
+    assert parse_roster("First Name,Last Name\nAda,Lovelace\nAlan,Turing\n") == ("Ada Lovelace", "Alan Turing")
+
+
+def test_parse_roster_without_header_takes_first_column():
+    assert parse_roster("Ada,6\n\nAlan,7\n") == ("Ada", "Alan")
+
+
+@pytest.mark.parametrize("text", ["", "\n\n", "Name\n", "Name\n,\n"])
+def test_parse_roster_rejects_empty(text):
+    with pytest.raises(ValueError, match="no student names"):
+        parse_roster(text)
+
+
+def test_parse_roster_rejects_duplicates():
+    with pytest.raises(ValueError, match="lists Ada more than once"):
+        parse_roster("Name\nAda\nAlan\nAda\n")
+
+
+@pytest.mark.parametrize("students, slots", [(10, 5), (40, 8), (300, 10), (1000, 6)])
+def test_schedule_problems_shares_at_most_one(students, slots):
+    sheets = schedule_problems(students, slots, class_pool_size(students, slots))
+    assert len(set(sheets)) == students
+    assert all(len(sheet) == slots for sheet in sheets)
+    sets = [set(sheet) for sheet in sheets]
+    assert max(len(first & second) for first, second in combinations(sets, 2)) <= 1
+
+
+def test_schedule_problems_rejects_small_pool():
+    with pytest.raises(ValueError, match="4 problems cannot make 50 different worksheets of 2 problems"):
+        schedule_problems(50, 2, 4)
+
+
+def test_class_set_without_riddles_shares_at_most_one(generator):
+    requests = class_set_requests(ROSTER, ["6.RP.A.1", "6.EE.A.1"], 8, False, batch_seed=3, generator=generator)
+    assert len(requests) == 2 * len(ROSTER)
+    assert [request.student for request in requests[:len(ROSTER)]] == list(ROSTER)
+    assert shared_problems(requests) == brute_force_shared(requests)
+    assert max(shared_problems(requests).values()) <= 1
+
+
+def test_riddle_class_set(generator):
+    requests = class_set_requests(ROSTER, ["6.RP.A.1"], 6, True, batch_seed=5, generator=generator)
+    assert len({request.problems for request in requests}) == len(ROSTER)
+    for request in requests:
+        letters = request.riddle[2].upper()
+        answers = {}
+        for letter, (_, answer) in zip(letters, request.problems):
+            assert answers.setdefault(letter, extract_numeric(answer)) == extract_numeric(answer)
+        assert len(set(answers.values())) == len(answers)
+    assert shared_problems(requests) == brute_force_shared(requests)
+
+
+def test_riddle_class_set_is_reproducible_from_batch_seed(generator):
+    def schedule(batch_seed):
+        return [(request.problems, request.riddle)
+                for request in class_set_requests(ROSTER, ["6.RP.A.1"], 6, True, batch_seed=batch_seed,
+                                                  generator=generator)]
+
+    assert schedule(5) == schedule(5)
+    assert schedule(5) != schedule(6)
+
+
+def test_small_pool_falls_back_to_balanced_and_reports_overlap(generator):
+    requests = class_set_requests(ROSTER, ["6.G.A.4"], 2, False, batch_seed=1, generator=generator)
+    assert len({request.problems for request in requests}) == len(ROSTER)
+    shared = shared_problems(requests)
+    assert shared == brute_force_shared(requests)
+    assert shared["6.G.A.4"] <= max(MAX_SHARED, 1)
+
+
+def test_class_set_rejects_pool_too_small(generator):
+    roster = [f"Student {i}" for i in range(50)]
+    with pytest.raises(ValueError, match="Cannot make 50 different worksheets for standard 6.G.A.4"):
+        class_set_requests(roster, ["6.G.A.4"], 1, False, batch_seed=1, generator=generator)
+
+
+@pytest.mark.parametrize("roster, message", [((), "no student names"), (("Ada", "Ada"), "lists Ada more than once")])
+def test_class_set_rejects_bad_roster(roster, message):
+    with pytest.raises(ValueError, match=message):
+        class_set_requests(roster, ["6.RP.A.1"], 6, False)
+    with pytest.raises(ValueError, match=message):
+        ClassSet(roster, ["6.RP.A.1"], 6, False)
+
+
+def test_requests_record_batch_seed(generator):
+    requests = class_set_requests(ROSTER[:5], ["6.RP.A.1"], 6, True, batch_seed=77, generator=generator)
+    assert {request.batch_seed for request in requests} == {77}
+    worksheet = generator.generate(requests[0])
+    assert worksheet.batch_seed == 77
+    assert _seed_line(worksheet).text == "Batch seed: 77, student 1"
+    assert _seed_line(generator.generate(WorksheetRequest("6.RP.A.1", 6, False, seed=5))).text == "Seed: 5"
+
+
+def test_class_set_draws_its_batch_seed_once(generator):
+    class_set = ClassSet(list(ROSTER[:10]), ["6.RP.A.1", "6.NS.B.2"], 6, False)
+    assert len(class_set) == 20
+    assert class_set.batch_seed is not None
+    assert class_set.requests(generator) == class_set.requests(generator)
+
+
+def test_batch_job_schedules_a_class_set():
+    class_set = ClassSet(ROSTER[:10], ["6.RP.A.1"], 6, True, batch_seed=9)
+    job = BatchJob(class_set, workers=1, artifacts=()).start()
+    assert job.total == 10
+    job.wait()
+    assert job.error is None
+    assert [result.request for result in job.completed()] == class_set.requests()
+    assert job.most_shared == shared_problems(class_set.requests())
+
+
+def test_batch_job_reports_unschedulable_class_set():
+    class_set = ClassSet([f"Student {i}" for i in range(50)], ["6.G.A.4"], 1, False, batch_seed=1)
+    job = BatchJob(class_set, workers=1, artifacts=()).start()
+    job.wait()
+    assert isinstance(job.error, ValueError)
+    assert job.completed() == []
@@ -0,0 +1,23 @@
+import pytest
+
+from exports import plan_documents
+from worksheet_generator import MathWorksheetGenerator, WorksheetRequest
+
+
+@pytest.fixture(scope="module")
+def worksheets():
+    generator = MathWorksheetGenerator()
+    return [generator.generate(WorksheetRequest("6.RP.A.1", 8, False, seed=version, version=version))
+            for version in range(1, 5)]
+
+
+@pytest.mark.parametrize("imposition", ["2up", "4up", "booklet"])
+def test_imposition_rejects_separate_files(worksheets, imposition):
+    with pytest.raises(ValueError, match="standard or batch layout"):
+        plan_documents(worksheets, "worksheet", "separate", imposition=imposition)
+
+
+def test_imposition_combines_a_standard_into_one_file(worksheets):
+    documents = plan_documents(worksheets, "worksheet", "standard", imposition="2up")
+    assert [document.name for document in documents] == ["6.RP.A.1_worksheets_2up.pdf"]
+    assert len(documents[0].worksheets) == 4
@@ -0,0 +1,35 @@
+import pytest
+
+from server import RequestError, parse_batch, parse_worksheet
+
+
+@pytest.mark.parametrize("riddles", ["false", "0", 0, 1, None])
+def test_riddles_must_be_a_boolean(riddles):
+    with pytest.raises(RequestError) as error:
+        parse_worksheet({"standard": "6.RP.A.1", "riddles": riddles})
+    assert error.value.status == 400
+
+
+@pytest.mark.parametrize("riddles", [True, False])
+def test_riddles_boolean_is_used(riddles):
+    request, _ = parse_worksheet({"standard": "6.RP.A.1", "riddles": riddles, "seed": 1})
+    assert request.use_riddles is riddles
+
+
+def test_compact_key_must_be_a_boolean():
+    with pytest.raises(RequestError) as error:
+        parse_batch({"grade": "6", "standards": ["6.RP.A.1"], "compact_key": "false"})
+    assert error.value.status == 400
+
+
+@pytest.mark.parametrize("grade", ["6", "6th", "6th Grade"])
+def test_grade_keys(grade):
+    requests, *_ = parse_batch({"grade": grade, "standards": ["6.RP.A.1"], "seed": 1})
+    assert requests[0].grade == "6th Grade"
+
+
+def test_imposition_needs_a_combined_layout():
+    with pytest.raises(RequestError) as error:
+        parse_batch({"grade": "6", "standards": ["6.RP.A.1"], "imposition": "2up"})
+    assert error.value.status == 400
+    parse_batch({"grade": "6", "standards": ["6.RP.A.1"], "imposition": "2up", "layout": "standard"})
@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+import time
+
+from storage import OWNER_FILE, SPOOL_PREFIX, ArtifactStore, cleanup_stale_spools
+
+
+def spooled_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("TMPDIR", str(tmp_path))
+    monkeypatch.setattr("tempfile.tempdir", None)
+    store = ArtifactStore(memory_limit=0)
+    store.put("a.pdf", b"%PDF")
+    return store
+
+
+def test_idle_live_store_survives_cleanup(tmp_path, monkeypatch):
+    store = spooled_store(tmp_path, monkeypatch)
+    spool_dir = store._spool_dir
+    day_ago = time.time() - 2 * 24 * 60 * 60
+    os.utime(spool_dir, (day_ago, day_ago))
+    assert cleanup_stale_spools() == 0
+    with store.open("a.pdf") as f:
+        assert f.read() == b"%PDF"
+
+
+def test_spool_of_exited_process_is_removed(tmp_path, monkeypatch):
+    monkeypatch.setenv("TMPDIR", str(tmp_path))
+    monkeypatch.setattr("tempfile.tempdir", None)
+    exited = subprocess.Popen([sys.executable, "-c", ""])
+    exited.wait()
+    spool_dir = tmp_path / f"{SPOOL_PREFIX}orphan"
+    spool_dir.mkdir()
+    (spool_dir / OWNER_FILE).write_text(str(exited.pid))
+    assert cleanup_stale_spools() == 1
+    assert not spool_dir.exists()
+
+
+def test_unowned_spool_is_removed_only_when_old(tmp_path, monkeypatch):
+    monkeypatch.setenv("TMPDIR", str(tmp_path))
+    monkeypatch.setattr("tempfile.tempdir", None)
+    spool_dir = tmp_path / f"{SPOOL_PREFIX}legacy"
+    spool_dir.mkdir()
+    assert cleanup_stale_spools() == 0
+    day_ago = time.time() - 2 * 24 * 60 * 60
+    os.utime(spool_dir, (day_ago, day_ago))
+    assert cleanup_stale_spools() == 1
@@ -0,0 +1,25 @@
+import random
+
+import pytest
+
+from catalog import extract_numeric
+from templates import TEMPLATES
+
+ALL_TEMPLATES = sorted({template for templates in TEMPLATES.values() for template in templates},
+                       key=lambda template: template.__name__)
+SMALL_TARGETS = [str(n) for n in range(-3, 11)] + ["0.25", "0.5", "1.5"]
+
+
+@pytest.mark.parametrize("template", ALL_TEMPLATES, ids=lambda template: template.__name__)
+@pytest.mark.parametrize("target", SMALL_TARGETS)
+def test_small_targets_are_met_or_refused(template, target):
+    for seed in range(20):
+        result = template(random.Random(seed), target)
+        if result is not None:
+            problem, answer = result
+            assert extract_numeric(answer) == extract_numeric(target)
+
+
+@pytest.mark.parametrize("template", ALL_TEMPLATES, ids=lambda template: template.__name__)
+def test_untargeted_problems_are_seeded(template):
+    assert template(random.Random(7)) == template(random.Random(7))
@@ -0,0 +1,86 @@
+# textmetrics.py - Cached text measurement and line wrapping
+#
+# Glyph widths are looked up once per (font, character), and every
+# (text, font, size) measurement and every wrap is memoised. Problem texts,
+# labels and answers repeat heavily across a batch, so laying out thousands
+# of worksheets costs about the same per worksheet as laying out a handful.
+from functools import lru_cache
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from fonts import glyph_font
+
+# Bounded so a long-running server cannot grow the caches without limit
+TEXT_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=None)
+def glyph_width(font, char):
+    """Advance width of one character in 1/1000 em, from whichever face draws it"""
+    return stringWidth(char, glyph_font(font, char), 1000)
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def text_width(text, font, size):
+    """Width of text in points at font and size"""
+    return sum(glyph_width(font, char) for char in text) * size / 1000
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def text_runs(text, font):
+    """(font, text) runs covering text, in the fallback face wherever font lacks a glyph"""
+    runs = []
+    for char in text:
+        run_font = glyph_font(font, char)
+        if runs and runs[-1][0] == run_font:
+            runs[-1][1].append(char)
+        else:
+            runs.append((run_font, [char]))
+    return tuple((run_font, "".join(chars)) for run_font, chars in runs)
+
+
+def _fitting_prefix(word, font, size, max_width):
+    """Longest leading part of word no wider than max_width (at least one character)"""
+    end = 1
+    while end < len(word) and text_width(word[:end + 1], font, size) <= max_width:
+        end += 1
+    return word[:end]
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def wrap_text(text, font, size, max_width, indent=0):
+    """Lines of text no wider than max_width; lines after the first are indent points narrower"""
+    if text_width(text, font, size) <= max_width:
+        return (text,)
+
+    space = text_width(" ", font, size)
+    lines = []
+    line = ""
+    line_width = 0
+    for word in text.split(" "):
+        available = max_width - (indent if lines else 0)
+        word_width = text_width(word, font, size)
+        if line and line_width + space + word_width <= available:
+            line += " " + word
+            line_width += space + word_width
+            continue
+        if line:
+            lines.append(line)
+            available = max_width - indent
+        while word_width > available and len(word) > 1:
+            piece = _fitting_prefix(word, font, size, available)
+            lines.append(piece)
+            word = word[len(piece):]
+            word_width = text_width(word, font, size)
+            available = max_width - indent
+        line, line_width = word, word_width
+    lines.append(line)
+    return tuple(lines)
+
+
+def clear_caches():
+    """Forget every cached width and wrap, e.g. after registering a font under an existing name"""
+    glyph_width.cache_clear()
+    text_width.cache_clear()
+    text_runs.cache_clear()
+    wrap_text.cache_clear()
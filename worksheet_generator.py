@@ -0,0 +1,380 @@
+# worksheet_generator.py - Problem selection and PDF rendering for math worksheets
+import hashlib
+import random
+import secrets
+from dataclasses import dataclass, replace
+
+from catalog import RIDDLE_COMPATIBLE_STANDARDS, extract_numeric, find_standard, get_catalog
+from layout import COLUMNS
+from rendering import render_pdfs
+
+# Draws per template request before giving up on finding an unused problem
+TEMPLATE_ATTEMPTS = 25
+
+# Seeds are kept short enough to read off a printed worksheet
+SEED_LIMIT = 10**9
+
+
+def new_seed():
+    """Fresh random seed for a worksheet"""
+    return secrets.randbelow(SEED_LIMIT)
+
+
+def derive_seed(base_seed, *parts):
+    """Stable per-worksheet seed from a batch seed and e.g. (standard, version)"""
+    key = "|".join(str(part) for part in (base_seed,) + parts)
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], "big") % SEED_LIMIT
+
+
+@dataclass(frozen=True)
+class WorksheetRequest:
+    """Everything that determines a worksheet; seed=None draws a fresh one
+
+    problems, when given, are the (problem, answer) pairs to print instead of
+    drawing from the bank (see classsets.py); the seed then only orders them.
+    With a riddle as well, they print in the riddle's letter order and the
+    seed only fills the rest of the decoder. student is printed on the name
+    line. batch_seed is set on class-set requests, whose problems come from
+    the roster's schedule: the batch seed and the student's place on the roster,
+    not seed, are what regenerate them.
+    """
+    standard_code: str
+    num_problems: int
+    use_riddles: bool = True
+    seed: int = None
+    version: int = 1
+    grade: str = None
+    columns: int = 1
+    student: str = None
+    problems: tuple = None
+    riddle: tuple = None
+    batch_seed: int = None
+
+
+@dataclass(frozen=True)
+class Worksheet:
+    """Immutable generated worksheet: problems, riddle, decoder mapping and metadata
+
+    batch_seed is set on class-set worksheets; see WorksheetRequest.
+    """
+    standard_code: str
+    standard_name: str
+    grade: str
+    version: int
+    seed: int
+    problems: tuple
+    riddle: tuple = None
+    decoder: tuple = ()
+    columns: int = 1
+    student: str = None
+    batch_seed: int = None
+    
+    @property
+    def letter_mapping(self):
+        """Decoder as a letter -> value dict"""
+        return dict(self.decoder)
+
+
+class MathWorksheetGenerator:
+    def __init__(self, catalog=None):
+        # Banks are shared, read-only references; preview_state is the only per-instance state
+        self.catalog = catalog or get_catalog()
+        self.riddle_bank = self.catalog.riddle_bank
+        self.problem_banks = self.catalog.problem_banks
+        self.preview_state = None
+    
+    def riddle_for_length(self, length, rng):
+        """Get a riddle with exact length"""
+        if length in self.riddle_bank and self.riddle_bank[length]:
+            return rng.choice(self.riddle_bank[length])
+        # Fallback for lengths not in bank
+        return (f"Math riddle ({length} letters)", "M" * length, "M" * length)
+    
+    def _create_full_mapping(self, letter_to_answer, used_answers, rng):
+        """Create complete A-Z mapping with consistent formatting"""
+        alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+        mapping = {}
+        
+        # Check answer patterns
+        has_decimals = any('.' in str(a) for a in used_answers)
+        has_negatives = any(str(a).startswith('-') for a in used_answers)
+        has_ratios = any(':' in str(a) for a in used_answers)
+        
+        # Add known letter mappings
+        for letter, answer in letter_to_answer.items():
+            mapping[letter] = answer
+        
+        # Fill remaining letters with consistent format
+        for letter in alphabet:
+            if letter not in mapping:
+                if has_ratios:
+                    a = rng.randint(1, 9)
+                    b = rng.randint(1, 9)
+                    value = f"{a}:{b}"
+                elif has_decimals:
+                    value = f"{rng.uniform(1, 50):.1f}"
+                elif has_negatives:
+                    value = str(rng.randint(-50, 50))
+                else:
+                    value = str(rng.randint(1, 100))
+                
+                # Ensure unique value
+                while value in used_answers:
+                    if has_ratios:
+                        a = rng.randint(1, 9)
+                        b = rng.randint(1, 9)
+                        value = f"{a}:{b}"
+                    else:
+                        value = str(rng.randint(1, 100))
+                
+                mapping[letter] = value
+                used_answers.add(value)
+        
+        return mapping
+    
+
+    
+    def generate(self, request):
+        """Build a Worksheet for a WorksheetRequest without touching any generator state"""
+        standard_code = request.standard_code
+        if standard_code not in self.problem_banks:
+            raise ValueError(f"No problem bank for standard {standard_code}")
+        if request.columns not in COLUMNS:
+            raise ValueError(f"Worksheets print in {' or '.join(map(str, COLUMNS))} columns, not {request.columns}")
+        
+        seed = new_seed() if request.seed is None else request.seed
+        rng = random.Random(seed)
+        grade, standard_name = find_standard(standard_code)
+        if request.grade is not None:
+            grade = request.grade
+        
+        riddle = None
+        decoder = ()
+        can_use_riddles = standard_code in RIDDLE_COMPATIBLE_STANDARDS
+        if request.problems is not None and request.riddle is not None:
+            riddle = request.riddle
+            problems = list(request.problems)
+            letter_to_answer = {letter: extract_numeric(answer)
+                                for letter, (_, answer) in zip(riddle[2].upper(), problems)}
+            letter_mapping = self._create_full_mapping(letter_to_answer, set(letter_to_answer.values()), rng)
+            decoder = tuple(sorted(letter_mapping.items()))
+        elif request.problems is not None:
+            problems = list(request.problems)
+            rng.shuffle(problems)
+        elif request.use_riddles and can_use_riddles and request.num_problems >= 3:
+            riddle = self.riddle_for_length(request.num_problems, rng)
+            problems, letter_mapping = self._generate_problems_with_riddle(standard_code, request.num_problems, riddle, rng)
+            decoder = tuple(sorted(letter_mapping.items()))
+        else:
+            problems = self._generate_problems_no_riddle(standard_code, request.num_problems, rng)
+        
+        return Worksheet(
+            standard_code=standard_code,
+            standard_name=standard_name,
+            grade=grade,
+            version=request.version,
+            seed=seed,
+            problems=tuple(problems),
+            riddle=riddle,
+            decoder=decoder,
+            columns=request.columns,
+            student=request.student,
+            batch_seed=request.batch_seed
+        )
+    
+    def generate_preview(self, standard_code, num_problems, use_riddles, seed=None):
+        """Generate preview of problems with optional riddle; the same seed always gives the same worksheet"""
+        if standard_code not in self.problem_banks:
+            return None, None
+        
+        worksheet = self.generate(WorksheetRequest(standard_code, num_problems, use_riddles, seed))
+        self.preview_state = {
+            'problems': list(worksheet.problems),
+            'riddle': worksheet.riddle,
+            'letter_mapping': worksheet.letter_mapping if worksheet.riddle else None,
+            'standard_code': standard_code,
+            'seed': worksheet.seed,
+            'worksheet': worksheet
+        }
+        
+        return list(worksheet.problems), worksheet.riddle
+    
+    def _template_problem(self, standard_code, used_problem_texts, rng, target=None):
+        """Draw an unused problem from the standard's parametric templates, optionally with a set answer"""
+        templates = self.catalog.templates.get(standard_code)
+        if not templates:
+            return None
+        
+        # Template text may coincide with a hand-written problem; skip those so later bank draws stay unique
+        bank_texts = self.catalog.pools[standard_code].texts
+        for _ in range(TEMPLATE_ATTEMPTS):
+            result = rng.choice(templates)(rng, target)
+            if result is not None and result[0] not in used_problem_texts and result[0] not in bank_texts:
+                used_problem_texts.add(result[0])
+                return result
+        return None
+    
+    def problem_pool(self, standard_code, size, rng):
+        """The whole bank, topped up with template problems towards size, as unique (problem, answer) pairs in random order"""
+        if standard_code not in self.catalog.pools:
+            raise ValueError(f"No problem bank for standard {standard_code}")
+        
+        problems = [(problem, answer) for problem, answer, _ in self.catalog.pools[standard_code].problems]
+        used_problem_texts = {problem for problem, _ in problems}
+        while len(problems) < size:
+            result = self._template_problem(standard_code, used_problem_texts, rng)
+            if result is None:
+                break
+            problems.append(result)
+        rng.shuffle(problems)
+        return problems
+    
+    def answer_pool(self, standard_code, size, min_bucket, rng):
+        """Clean answer -> unique (problem, answer) pairs: the whole bank, topped up with template problems towards
+        size, then each answer's problems towards min_bucket"""
+        if standard_code not in self.catalog.pools:
+            raise ValueError(f"No problem bank for standard {standard_code}")
+        
+        pool = self.catalog.pools[standard_code]
+        buckets = {answer: [(problem, bank_answer) for problem, bank_answer, _ in entries]
+                   for answer, entries in pool.by_answer.items()}
+        used_problem_texts = set(pool.texts)
+        total = len(pool.problems)
+        while total < size:
+            result = self._template_problem(standard_code, used_problem_texts, rng)
+            if result is None:
+                break
+            buckets.setdefault(extract_numeric(result[1]), []).append(result)
+            total += 1
+        for answer, problems in buckets.items():
+            while len(problems) < min_bucket:
+                result = self._template_problem(standard_code, used_problem_texts, rng, answer)
+                if result is None:
+                    break
+                problems.append(result)
+        return buckets
+    
+    def _problems_for_answer(self, standard_code, answer, count, used_problem_texts, rng):
+        """Up to count unused problems with the given clean answer: bank bucket first, then templates"""
+        bucket = self.catalog.pools[standard_code].by_answer.get(answer, ())
+        drawn = [(problem, bank_answer) for problem, bank_answer, _ in rng.sample(bucket, min(count, len(bucket)))]
+        used_problem_texts.update(problem for problem, _ in drawn)
+        while len(drawn) < count:
+            result = self._template_problem(standard_code, used_problem_texts, rng, answer)
+            if result is None:
+                break
+            drawn.append(result)
+        return drawn
+    
+    def _template_answer(self, standard_code, count, used_answers, used_problem_texts, rng):
+        """Pick a fresh answer from a template problem and build count problems for it, or None"""
+        for _ in range(TEMPLATE_ATTEMPTS):
+            result = self._template_problem(standard_code, used_problem_texts, rng)
+            if result is None:
+                return None
+            answer = extract_numeric(result[1])
+            if answer not in used_answers:
+                drawn = [result] + self._problems_for_answer(standard_code, answer, count - 1, used_problem_texts, rng)
+                if len(drawn) == count:
+                    return answer, drawn
+                used_problem_texts.difference_update(problem for problem, _ in drawn)
+            else:
+                used_problem_texts.discard(result[0])
+        return None
+    
+    def _generate_problems_with_riddle(self, standard_code, num_problems, riddle, rng):
+        """Generate problems matching riddle answer letters - NO DUPLICATES, NO FALLBACKS"""
+        if standard_code not in self.catalog.pools:
+            raise ValueError(f"No problem bank for standard {standard_code}")
+        
+        pool = self.catalog.pools[standard_code]
+        has_templates = bool(self.catalog.templates.get(standard_code))
+        riddle_answer = riddle[2].upper()
+        
+        # Check if we have enough variety
+        if not has_templates and len(pool.problems) < num_problems:
+            raise ValueError(f"Not enough unique problems available for standard {standard_code}. Need {num_problems}, but only have {len(pool.problems)} unique problems.")
+        
+        letter_counts = {}
+        for letter in riddle_answer:
+            letter_counts[letter] = letter_counts.get(letter, 0) + 1
+        unique_letters = list(letter_counts)
+        
+        # Map unique letters to unique answers from actual problems
+        bank_answers = rng.sample(pool.answers, min(len(unique_letters), len(pool.answers)))
+        used_answers = set(bank_answers)
+        letter_to_answer = {}
+        letter_problems = {}
+        used_problem_texts = set()
+        for index, letter in enumerate(unique_letters):
+            count = letter_counts[letter]
+            if index < len(bank_answers):
+                answer = bank_answers[index]
+                drawn = self._problems_for_answer(standard_code, answer, count, used_problem_texts, rng)
+                if len(drawn) == count or not has_templates:
+                    letter_to_answer[letter] = answer
+                    letter_problems[letter] = drawn
+                    continue
+                used_problem_texts.difference_update(problem for problem, _ in drawn)
+            
+            # Bank can't cover this letter: let a template choose an answer it can repeat
+            picked = self._template_answer(standard_code, count, used_answers, used_problem_texts, rng) if has_templates else None
+            if picked is not None:
+                letter_to_answer[letter], letter_problems[letter] = picked
+                used_answers.add(picked[0])
+            elif index < len(bank_answers):
+                letter_to_answer[letter] = bank_answers[index]
+                letter_problems[letter] = self._problems_for_answer(standard_code, bank_answers[index], count, used_problem_texts, rng)
+            else:
+                # Cannot generate valid riddle with available problems
+                raise ValueError(f"Cannot generate valid riddle mapping for standard {standard_code}. Not enough unique answers.")
+        
+        # Now generate problems for each position in riddle
+        problems = []
+        for letter in riddle_answer:
+            target_answer = letter_to_answer[letter]
+            if letter_problems[letter]:
+                problems.append(letter_problems[letter].pop())
+                continue
+            
+            # Try to find any unused problem and use with adjusted answer
+            unused = [problem for problem, _, _ in pool.problems if problem not in used_problem_texts]
+            if not unused:
+                # Cannot complete worksheet - not enough unique problems
+                raise ValueError(f"Cannot generate {num_problems} unique problems for standard {standard_code}. Consider reducing the number of problems or disabling riddles for this standard.")
+            problem = rng.choice(unused)
+            problems.append((problem, target_answer))
+            used_problem_texts.add(problem)
+        
+        # Create full letter mapping
+        return problems, self._create_full_mapping(letter_to_answer, used_answers, rng)
+    
+    def _generate_problems_no_riddle(self, standard_code, num_problems, rng):
+        """Generate problems without riddle constraint - NO DUPLICATES, NO FALLBACKS"""
+        if standard_code not in self.catalog.pools:
+            raise ValueError(f"No problem bank for standard {standard_code}")
+        
+        pool = self.catalog.pools[standard_code]
+        
+        # Hand-written problems first; the pool is deduplicated, so a sample is unique
+        drawn = rng.sample(pool.problems, min(num_problems, len(pool.problems)))
+        problems = [(problem, answer) for problem, answer, _ in drawn]
+        used_problem_texts = {problem for problem, _ in problems}
+        
+        # Top up from parametric templates when the bank runs dry
+        while len(problems) < num_problems:
+            result = self._template_problem(standard_code, used_problem_texts, rng)
+            if result is None:
+                raise ValueError(f"Not enough unique problems available for standard {standard_code}. Need {num_problems}, but only have {len(problems)} unique problems.")
+            problems.append(result)
+        
+        rng.shuffle(problems)
+        return problems
+    
+    def generate_worksheet_from_preview(self, grade, worksheet_num=1):
+        """Generate worksheet PDFs from stored preview"""
+        if not self.preview_state:
+            return None, None
+        
+        worksheet = replace(self.preview_state['worksheet'], grade=grade, version=worksheet_num)
+        return render_pdfs(worksheet)